@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Compare the compiled description normalizer with the original re.sub chain.
+
+Checks that both give identical output on synthetic (or stored) product
+descriptions, then times the original per-description function, the
+compiled per-description path and the batch path.
+
+Usage:
+    python benchmarks/preprocess_text.py                  # synthetic data
+    python benchmarks/preprocess_text.py --request-id 42
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from services.clustering import ClusterKeywordExtractor  # noqa: E402
+
+WORDS = (
+    "wireless bluetooth earbuds noise cancelling headphones stainless steel water bottle "
+    "insulated kitchen knife set organic cotton yoga mat non-slip gaming mouse ergonomic "
+    "led desk lamp dimmable usb-c charger fast charging premium new original for with and "
+    "Wireless Bluetooth Kitchen Premium SONY ANKER (case) & more! 100% 4K 1080p"
+).split()
+
+# Specs, URLs and non-ASCII text, mixed in now and then
+EXTRAS = (
+    "size XL|color: black|500ml|12oz|2-pack|3 pack|10x12|5.5 inch|64GB|https://example.com/item|"
+    "www.shop.com|café|naïve|ΣΟΦΙΑΣ|™|ſize m|ıx|٣ pack|İnch"
+).split("|")
+
+# Strings that exercise pattern interactions and Unicode case folding
+EDGE_CASES = [
+    "size 5gb x",
+    "5 5gb pack",
+    "SIZE\nlarge COLOR:red 3X4 2-Pack",
+    "ſize 10 ſıze ı ſ 5ıx6",
+    "٣٤ gb ٣x٤ color:٣",
+    "K-pack 5 pacK 12Kg",
+    "http://a.b/c?d=1 www.x.y end",
+    "a-5-b 5-6 -7- x.5.y",
+    "ΣΑΣ. ΟΔΟΣ",
+    "",
+    None,
+]
+
+
+def synthetic_descriptions(n: int, seed: int = 0) -> List[str]:
+    """Random product-like titles, some with specs, URLs or non-ASCII text."""
+    rng = random.Random(seed)
+    separators = [" ", " ", " ", " ", "  ", ", ", " - "]
+
+    def word() -> str:
+        return rng.choice(EXTRAS) if rng.random() < 0.03 else rng.choice(WORDS)
+
+    return [
+        "".join(word() + rng.choice(separators) for _ in range(rng.randint(0, 25)))
+        for _ in range(n)
+    ]
+
+
+def original_preprocess(extractor: ClusterKeywordExtractor, text: str) -> str:
+    """``preprocess_text`` as it was before the compiled normalizer."""
+    if not isinstance(text, str):
+        return ""
+
+    text = text.lower()
+    text = re.sub(r"http\S+|www\.\S+", "", text)
+    for pattern in extractor.spec_patterns:
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    text = re.sub(extractor.brand_pattern, "", text)
+    text = re.sub(r"[^\w\s-]", " ", text)
+    text = re.sub(r"\b\d+\b", "", text)
+    words = [w for w in text.split() if w not in extractor.noise_words and len(w) > 2]
+    return " ".join(words).strip()
+
+
+def request_descriptions(request_id: int) -> List[str]:
+    """Descriptions of a stored request."""
+    from database import get_db, ProductMetricsDB
+
+    with get_db() as session:
+        rows = (
+            session.query(ProductMetricsDB.description)
+            .filter(ProductMetricsDB.request_id == request_id)
+            .all()
+        )
+    return [r[0] for r in rows]
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    """Fastest of ``repeat`` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--request-id", type=int)
+    parser.add_argument("--descriptions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.request_id is not None:
+        texts = request_descriptions(args.request_id)
+    else:
+        texts = synthetic_descriptions(args.descriptions)
+
+    texts = texts + EDGE_CASES
+
+    extractor = ClusterKeywordExtractor()
+    expected = [original_preprocess(extractor, t) for t in texts]
+    single = [extractor.preprocess_text(t) for t in texts]
+    batch = extractor.preprocess_texts(texts)
+
+    mismatches = sum(a != b for a, b in zip(expected, single)) + sum(
+        a != b for a, b in zip(expected, batch)
+    )
+    print(f"{len(texts)} descriptions, {mismatches} mismatches")
+
+    baseline = best_of(args.repeat, lambda: [original_preprocess(extractor, t) for t in texts])
+    compiled = best_of(args.repeat, lambda: [extractor.preprocess_text(t) for t in texts])
+    batched = best_of(args.repeat, lambda: extractor.preprocess_texts(texts))
+    print(f"{'original':>10}: {baseline * 1000:8.1f} ms")
+    print(f"{'compiled':>10}: {compiled * 1000:8.1f} ms ({baseline / compiled:.1f}x)")
+    print(f"{'batch':>10}: {batched * 1000:8.1f} ms ({baseline / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Check clustering quality and speed with embedding reduction.
+
+Clusters the same embeddings with and without each reduction method and
+prints the adjusted Rand index against the unreduced labels.
+
+Usage:
+    python benchmarks/reduction_quality.py                # synthetic data
+    python benchmarks/reduction_quality.py --request-id 42
+"""
+
+import argparse
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from config.constants import CLUSTERER_CONFIG  # noqa: E402
+from services.clustering.reduction import evaluate_reduction  # noqa: E402
+
+
+def synthetic_embeddings(
+    n_products: int, n_niches: int, dimensions: int, noise: float, seed: int = 0
+) -> np.ndarray:
+    """Unit vectors scattered around random niche centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_niches, dimensions))
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+
+    points = centres[rng.integers(0, n_niches, n_products)]
+    points = points + rng.normal(scale=noise / np.sqrt(dimensions), size=points.shape)
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32)
+
+
+def request_embeddings(request_id: int) -> np.ndarray:
+    """Embedding matrix of a stored request."""
+    from database import get_db, ProductMetricsDB
+
+    with get_db() as session:
+        rows = (
+            session.query(ProductMetricsDB.embedding)
+            .filter(ProductMetricsDB.request_id == request_id)
+            .all()
+        )
+    return np.array([r[0] for r in rows], dtype=np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--request-id", type=int)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--niches", type=int, default=40)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--noise", type=float, default=0.6)
+    parser.add_argument("--components", type=int, default=CLUSTERER_CONFIG.REDUCTION_DIMENSIONS)
+    args = parser.parse_args()
+
+    if args.request_id is not None:
+        embeddings = request_embeddings(args.request_id)
+    else:
+        embeddings = synthetic_embeddings(
+            args.products, args.niches, args.dimensions, args.noise
+        )
+
+    print(f"{embeddings.shape[0]} products x {embeddings.shape[1]} dims")
+    for method in ("svd", "random_projection"):
+        config = replace(
+            CLUSTERER_CONFIG,
+            REDUCTION_METHOD=method,
+            REDUCTION_DIMENSIONS=args.components,
+        )
+        report = evaluate_reduction(embeddings, config)
+        print(
+            f"{method:>18}: ARI={report['adjusted_rand_index']:.3f} "
+            f"clusters {report['baseline_clusters']:.0f}->{report['reduced_clusters']:.0f} "
+            f"cluster {report['baseline_seconds']:.2f}s -> "
+            f"{report['reduction_seconds'] + report['reduced_clustering_seconds']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Build keyword corpora from every stored product description.
+
+Groups products by their request's vertical category and region and
+rebuilds the matching corpus from their descriptions (see
+KEYWORD_IDF_SCOPE="corpus"). Each corpus is cleared and rebuilt in one
+transaction, so no description is counted twice and readers keep the old
+counts until it commits.
+
+Usage:
+    python scripts/build_keyword_corpus.py
+    python scripts/build_keyword_corpus.py --vertical electronics --region us
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+load_dotenv()
+
+from database import get_db, ProductMetricsDB, SearchCriteriaDB  # noqa: E402
+from services.clustering import ClusterKeywordExtractor, KeywordCorpusStore  # noqa: E402
+from services.clustering.keyword_corpus import corpus_key  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vertical")
+    parser.add_argument("--region")
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    store = KeywordCorpusStore()
+    extractor = ClusterKeywordExtractor()
+    start = time.perf_counter()
+
+    with get_db() as session:
+        criteria = session.execute(
+            select(
+                SearchCriteriaDB.request_id,
+                SearchCriteriaDB.vertical_category,
+                SearchCriteriaDB.target_region,
+            )
+        ).all()
+
+    # Request ids per corpus
+    wanted_vertical, wanted_region = corpus_key(args.vertical or "", args.region or "")
+    corpora: Dict[Tuple[str, str], List[int]] = {}
+    for request_id, vertical, region in criteria:
+        key = corpus_key(vertical or "", region or "")
+        if args.vertical is not None and key[0] != wanted_vertical:
+            continue
+        if args.region is not None and key[1] != wanted_region:
+            continue
+        corpora.setdefault(key, []).append(request_id)
+
+    for (vertical, region), request_ids in corpora.items():
+        documents = 0
+        after_id = 0
+        with get_db() as session:
+            store.clear(session, vertical, region)
+            while True:
+                rows = session.execute(
+                    select(ProductMetricsDB.id, ProductMetricsDB.description)
+                    .where(
+                        ProductMetricsDB.request_id.in_(request_ids),
+                        ProductMetricsDB.id > after_id,
+                    )
+                    .order_by(ProductMetricsDB.id)
+                    .limit(args.batch_size)
+                ).all()
+                if not rows:
+                    break
+
+                update = store.add_documents(
+                    session,
+                    vertical,
+                    region,
+                    extractor.tokenize([description for _, description in rows]),
+                )
+                # Descriptions with no tokens are not counted
+                documents += update.documents if update else 0
+                after_id = rows[-1][0]
+            session.commit()
+
+        print(f"{vertical or '-'}/{region or '-'}: {documents} descriptions")
+
+    print(f"built {len(corpora)} corpora in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Recompute product_metrics.score with the current ProductScorerConfig.
+
+Usage:
+    python scripts/rescore_products.py                 # whole table
+    python scripts/rescore_products.py --request-id 42
+    python scripts/rescore_products.py --dry-run
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+load_dotenv()
+
+from services.scoring import rescore_products  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--request-id", type=int)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    changed = rescore_products(
+        request_id=args.request_id,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    elapsed = time.perf_counter() - start
+
+    verb = "would change" if args.dry_run else "updated"
+    print(f"{verb} {changed} product scores in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
 """Configuration module."""
 
-from .settings import Settings, get_settings
-from .constants import ProductScorerConfig, TrendScorerConfig, ClustererConfig
+from .settings import Settings, get_settings, get_embedding_dimensions
+from .constants import (
+    ProductScorerConfig,
+    TrendScorerConfig,
+    ClustererConfig,
+    ScraperConfig,
+    EmbeddingConfig,
+    VectorIndexConfig,
+    TrendsConfig,
+)
 
 __all__ = [
     "Settings",
     "get_settings",
+    "get_embedding_dimensions",
     "ProductScorerConfig",
     "TrendScorerConfig",
     "ClustererConfig",
+    "ScraperConfig",
+    "EmbeddingConfig",
+    "VectorIndexConfig",
+    "TrendsConfig",
 ]
@@ -42,12 +42,133 @@ class ClustererConfig:
     DBSCAN_EPS: float = 0.3
     DBSCAN_MIN_SAMPLES: int = 2
     DBSCAN_METRIC: str = "cosine"
+    # Neighbour search for the Euclidean engines: "auto", "ball_tree",
+    # "kd_tree" or "brute". "auto" was fastest even at 128 dims (ball_tree
+    # ~15x and kd_tree ~45x slower on 10k products), so leave it unless measured.
+    DBSCAN_ALGORITHM: str = "auto"
+
+    # "dbscan_cosine", "dbscan_euclidean", "dbscan_radius_graph" or "hdbscan".
+    # dbscan_euclidean gives the same labels as dbscan_cosine (unit vectors)
+    # but is ~3x slower on full-size embeddings; dbscan_cosine is the default.
+    CLUSTERING_ENGINE: str = "dbscan_cosine"
+    HDBSCAN_MIN_CLUSTER_SIZE: int = 3
+    # Parallel workers for neighbour search (-1 = all cores)
+    N_JOBS: int = -1
 
     TRENDS_TIME_RANGE: str = "today 12-m"
     CLUSTER_KEYWORDS_LIMIT: int = 5
+    # Keyword TF-IDF: "cluster" fits per cluster; "request" fits once over
+    # all of the request's descriptions (noise included), so IDF favours
+    # terms that set a cluster apart;
+    # "corpus" uses stored document frequencies of every description scraped
+    # for the same vertical and region (and adds each request to them)
+    KEYWORD_IDF_SCOPE: str = "cluster"
+    # Below this many documents a corpus is too cold; "request" is used instead
+    KEYWORD_CORPUS_MIN_DOCUMENTS: int = 200
+    # Document-frequency bounds for corpus terms (count, fraction of documents)
+    KEYWORD_CORPUS_MIN_DF: int = 2
+    KEYWORD_CORPUS_MAX_DF: float = 0.8
+
+    # Optional dimensionality reduction before clustering:
+    # "none", "svd" (uncentred PCA) or "random_projection"
+    REDUCTION_METHOD: str = "none"
+    REDUCTION_DIMENSIONS: int = 128
+    # Smaller requests are clustered on the raw embeddings
+    REDUCTION_MIN_SAMPLES: int = 1000
+    REDUCTION_RANDOM_STATE: int = 42
+    # If set, a fitted projection is loaded from / saved to this path
+    REDUCTION_MODEL_PATH: str = ""
+
+    # Incremental mode: products within DBSCAN_EPS (cosine) of a stored
+    # cluster centroid join that niche; only the rest are clustered
+    INCREMENTAL: bool = False
+    INCREMENTAL_MAX_CENTROIDS: int = 5000
+
+
+@dataclass(frozen=True)
+class ScraperConfig:
+    """Configuration for Apify product scraping."""
+
+    AMAZON_ACTOR_ID: str = "9GmEDf8sr9Jyb6b3X"
+    AMAZON_SORT_BY: str = "relevanceblender"
+    AMAZON_MAX_PAGES: int = 1
+
+    # Upper bound on actor runs in flight at once (1 = sequential)
+    MAX_CONCURRENT_RUNS: int = 5
+
+    # Products per streamed batch (normalize -> score -> embed -> insert)
+    STREAM_BATCH_SIZE: int = 50
+
+    # Scrape result cache, keyed by actor id + run input
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    # Past the TTL, serve the cached result for this much longer while
+    # re-running the actor in the background (0 disables)
+    CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = 6 * 60 * 60
+
+
+@dataclass(frozen=True)
+class EmbeddingConfig:
+    """Configuration for batched embedding requests."""
+
+    # Per-request limits (OpenAI allows 2048 inputs / 300k tokens)
+    BATCH_MAX_TOKENS: int = 100_000
+    BATCH_MAX_INPUTS: int = 512
+
+    MAX_CONCURRENT_BATCHES: int = 4
+
+    # Backoff on HTTP 429
+    MAX_RETRIES: int = 5
+    RETRY_BASE_DELAY_SECONDS: float = 1.0
+    RETRY_MAX_DELAY_SECONDS: float = 30.0
+
+
+@dataclass(frozen=True)
+class VectorIndexConfig:
+    """Configuration for the pgvector HNSW index and similarity queries."""
+
+    HNSW_M: int = 16
+    HNSW_EF_CONSTRUCTION: int = 64
+    # Candidate list size at query time; raise for better recall
+    HNSW_EF_SEARCH: int = 40
+
+    SIMILAR_PRODUCTS_LIMIT: int = 10
+
+
+@dataclass(frozen=True)
+class TrendsConfig:
+    """Configuration for DataForSEO trend lookups."""
+
+    # Keyword sets (tasks) sent per HTTP call. The Trends Explore live
+    # endpoint currently accepts one task per call; raise this if the
+    # account or endpoint allows more (DataForSEO's general cap is 100).
+    TASKS_PER_REQUEST: int = 1
+    # HTTP calls in flight at once
+    MAX_CONCURRENT_REQUESTS: int = 5
+
+    # Preset range for Trends Explore (same as the API default)
+    TIME_RANGE: str = "past_12_months"
+    # DataForSEO location code for target regions without a known code
+    # (see dataforseo.REGION_LOCATION_CODES); 0 = worldwide
+    LOCATION_CODE: int = 0
+
+    # Stored trend points (trend_points table), refreshed with delta fetches
+    STORE_ENABLED: bool = True
+    # Points read back for scoring
+    WINDOW_DAYS: int = 365
+    # Keywords not refreshed for longer than this get a full re-fetch
+    DELTA_MAX_DAYS: int = 180
+    # Deltas are rescaled onto the stored series through the overlapping
+    # period; below this value the ratio is too coarse and the keyword is
+    # re-fetched in full instead
+    MIN_OVERLAP_VALUE: float = 5.0
 
 
 # Default instances
 PRODUCT_SCORER_CONFIG = ProductScorerConfig()
 TREND_SCORER_CONFIG = TrendScorerConfig()
 CLUSTERER_CONFIG = ClustererConfig()
+SCRAPER_CONFIG = ScraperConfig()
+EMBEDDING_CONFIG = EmbeddingConfig()
+VECTOR_INDEX_CONFIG = VectorIndexConfig()
+TRENDS_CONFIG = TrendsConfig()
@@ -27,6 +27,15 @@ class Settings(BaseSettings):
     # LLM Configuration
     chat_model: str = Field(default="gpt-4o-mini")
     embeddings_model: str = Field(default="text-embedding-3-small")
+    embedding_cache_enabled: bool = Field(default=True)
+
+    # Embeddings backend: "openai", "hashing" (local, stateless) or
+    # "sentence-transformers" (local, needs the optional package)
+    embeddings_backend: str = Field(default="openai")
+    local_embeddings_model: str = Field(default="sentence-transformers/all-MiniLM-L6-v2")
+    # Must match the chosen backend; sizes the pgvector columns (see
+    # EmbeddingSettings, which the database layer reads at import time)
+    embedding_dimensions: int = Field(default=1536)
     temperature: float = Field(default=0.1)
 
     class Config:
@@ -35,7 +44,31 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
+class EmbeddingSettings(BaseSettings):
+    """
+    The embedding size alone, read from the same environment.
+
+    The ORM models need it when ``database`` is imported; reading it through
+    ``Settings`` would require every API credential just to touch the DB.
+    frontend/prisma/schema.prisma declares the vector columns as
+    vector(1536) and must be edited to match any other size.
+    """
+
+    embedding_dimensions: int = Field(default=1536)
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
 @lru_cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
+
+
+@lru_cache
+def get_embedding_dimensions() -> int:
+    """Configured embedding size, without loading the full settings."""
+    return EmbeddingSettings().embedding_dimensions
@@ -5,7 +5,9 @@ This module defines the state that flows through the LangGraph.
 It imports from schemas (which have no circular dependencies).
 """
 
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 from pydantic import BaseModel, Field
 
 from schemas import (
@@ -34,7 +36,15 @@ class GraphState(BaseModel):
     # 3. Execution Phase
     scraped_products_id: List[int] = Field(default_factory=list)
     scraped_products: List[ProductMetrics] = Field(default_factory=list)
+    # One contiguous float32 matrix per request; products refer to it by
+    # embedding_row, aligned with scraped_products_id
+    embeddings: Optional[np.ndarray] = None
 
     # 4. Analysis Phase
     cluster_ids: List[int] = Field(default_factory=list)
     clusters: List[ProductCluster] = Field(default_factory=list)
+
+    class Config:
+        """Pydantic configuration."""
+
+        arbitrary_types_allowed = True
@@ -1,12 +1,19 @@
 """Database module."""
 
 from .connection import get_db, get_session_factory, get_engine, init_db
+from .converters import product_from_db
+from .queries import load_embedding_matrix, load_products, load_product_columns
 from .models import (
     Base,
     RequestDB,
     SearchCriteriaDB,
     ProductMetricsDB,
     ProductClustersDB,
+    ScrapeCacheDB,
+    EmbeddingCacheDB,
+    TrendPointDB,
+    KeywordCorpusDB,
+    KeywordTermDB,
 )
 
 # Backwards compatibility
@@ -18,9 +25,18 @@ __all__ = [
     "get_engine",
     "init_db",
     "SessionLocal",
+    "product_from_db",
+    "load_embedding_matrix",
+    "load_products",
+    "load_product_columns",
     "Base",
     "RequestDB",
     "SearchCriteriaDB",
     "ProductMetricsDB",
     "ProductClustersDB",
+    "ScrapeCacheDB",
+    "EmbeddingCacheDB",
+    "TrendPointDB",
+    "KeywordCorpusDB",
+    "KeywordTermDB",
 ]
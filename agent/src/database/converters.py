@@ -0,0 +1,36 @@
+"""
+Conversions between ORM rows and schema objects.
+"""
+
+from schemas import ProductMetrics, Platforms, Currencies
+from .models import ProductMetricsDB
+
+
+def product_from_db(db_product: ProductMetricsDB, embedding_row: int = -1) -> ProductMetrics:
+    """Convert database product (ORM object or ``load_products`` row) to schema."""
+    return ProductMetrics(
+        keyword_searched=db_product.keyword_searched,
+        platform=(
+            Platforms(db_product.platform)
+            if db_product.platform in [p.value for p in Platforms]
+            else Platforms.UNKNOWN
+        ),
+        unique_id=db_product.unique_id,
+        description=db_product.description,
+        price=db_product.price,
+        currency=(
+            Currencies(db_product.currency)
+            if db_product.currency in [c.value for c in Currencies]
+            else Currencies.UNKNOWN
+        ),
+        image_url=db_product.image_url,
+        platform_category=db_product.platform_category,
+        platform_region=db_product.platform_region,
+        rating=db_product.rating,
+        review_count=db_product.review_count,
+        sales_last_month=db_product.sales_last_month,
+        search_ranking=db_product.search_ranking,
+        sponsored=db_product.sponsored,
+        score=db_product.score,
+        embedding_row=embedding_row,
+    )
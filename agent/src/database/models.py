@@ -2,13 +2,20 @@
 SQLAlchemy ORM models for the database.
 """
 
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, List, Optional
 
-from sqlalchemy import ForeignKey, String, Integer, Boolean, Float
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import ForeignKey, String, Integer, Boolean, Float, Date, DateTime, Index
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from pgvector.sqlalchemy import Vector
 
+from config import get_embedding_dimensions
+from config.constants import VECTOR_INDEX_CONFIG
+
+# Vector size of every embedding column, set by the configured backend
+EMBEDDING_DIMENSIONS = get_embedding_dimensions()
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
@@ -66,6 +73,19 @@ class ProductMetricsDB(Base):
     """Scraped product metrics record."""
 
     __tablename__ = "product_metrics"
+    __table_args__ = (
+        # Approximate nearest-neighbour search on cosine distance
+        Index(
+            "ix_product_metrics_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={
+                "m": VECTOR_INDEX_CONFIG.HNSW_M,
+                "ef_construction": VECTOR_INDEX_CONFIG.HNSW_EF_CONSTRUCTION,
+            },
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -89,14 +109,14 @@ class ProductMetricsDB(Base):
     score: Mapped[float] = mapped_column(Float)
 
     # Embedding vector
-    embedding: Mapped[Vector] = mapped_column(Vector(1536))
+    embedding: Mapped[Vector] = mapped_column(Vector(EMBEDDING_DIMENSIONS))
 
     # Foreign keys
-    request_id: Mapped[int] = mapped_column(ForeignKey("requests.id"))
+    request_id: Mapped[int] = mapped_column(ForeignKey("requests.id"), index=True)
     request: Mapped["RequestDB"] = relationship(back_populates="product_metrics")
 
     cluster_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("product_clusters.id"), nullable=True
+        ForeignKey("product_clusters.id"), nullable=True, index=True
     )
     cluster: Mapped[Optional["ProductClustersDB"]] = relationship(
         back_populates="product_metrics"
@@ -134,11 +154,98 @@ class ProductClustersDB(Base):
     average_search_ranking: Mapped[int] = mapped_column(Integer)
     average_product_score: Mapped[float] = mapped_column(Float)
 
+    # Incremental clustering: canonical clusters (no parent) keep a running
+    # mean of their members' unit embeddings; request clusters assigned to
+    # an existing niche point at it through parent_cluster_id
+    centroid: Mapped[Optional[Vector]] = mapped_column(
+        Vector(EMBEDDING_DIMENSIONS), nullable=True
+    )
+    centroid_size: Mapped[int] = mapped_column(Integer, default=0)
+    parent_cluster_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("product_clusters.id"), nullable=True
+    )
+
     # Foreign key
-    request_id: Mapped[int] = mapped_column(ForeignKey("requests.id"))
+    request_id: Mapped[int] = mapped_column(ForeignKey("requests.id"), index=True)
     request: Mapped["RequestDB"] = relationship(back_populates="product_clusters")
 
     # Relationship
     product_metrics: Mapped[List["ProductMetricsDB"]] = relationship(
         back_populates="cluster", cascade="all, delete-orphan"
     )
+
+
+class ScrapeCacheDB(Base):
+    """Cached normalized scrape results for one actor input."""
+
+    __tablename__ = "scrape_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    actor_id: Mapped[str] = mapped_column(String(50))
+    run_input: Mapped[Any] = mapped_column(JSONB)
+    products: Mapped[Any] = mapped_column(JSONB)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"ScrapeCache(actor_id={self.actor_id!r}, fetched_at={self.fetched_at!r})"
+
+
+class EmbeddingCacheDB(Base):
+    """Cached embedding vector keyed by a hash of model name and text."""
+
+    __tablename__ = "embedding_cache"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100))
+    embedding: Mapped[Vector] = mapped_column(Vector(EMBEDDING_DIMENSIONS))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"EmbeddingCache(model={self.model!r}, content_hash={self.content_hash!r})"
+
+
+class TrendPointDB(Base):
+    """One stored search-interest point of a keyword's trend series."""
+
+    __tablename__ = "trend_points"
+
+    keyword: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # DataForSEO location code, 0 = worldwide
+    location_code: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Start of the period the value covers
+    point_date: Mapped[date] = mapped_column("date", Date, primary_key=True)
+    # Relative interest, on the scale of the keyword's last full fetch
+    value: Mapped[float] = mapped_column(Float)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"TrendPoint(keyword={self.keyword!r}, date={self.point_date!r})"
+
+
+class KeywordCorpusDB(Base):
+    """Document count of one vertical/region keyword corpus."""
+
+    __tablename__ = "keyword_corpora"
+
+    vertical: Mapped[str] = mapped_column(String(50), primary_key=True)
+    region: Mapped[str] = mapped_column(String(10), primary_key=True)
+    document_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"KeywordCorpus(vertical={self.vertical!r}, region={self.region!r})"
+
+
+class KeywordTermDB(Base):
+    """Number of corpus documents (product descriptions) containing a term."""
+
+    __tablename__ = "keyword_terms"
+
+    vertical: Mapped[str] = mapped_column(String(50), primary_key=True)
+    region: Mapped[str] = mapped_column(String(10), primary_key=True)
+    # 1- to 3-gram of normalized description tokens
+    term: Mapped[str] = mapped_column(String(255), primary_key=True)
+    document_frequency: Mapped[int] = mapped_column(Integer)
+
+    def __repr__(self) -> str:
+        return f"KeywordTerm(term={self.term!r}, df={self.document_frequency!r})"
@@ -0,0 +1,197 @@
+"""
+Bulk read paths that skip ORM object hydration.
+"""
+
+import io
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Row, func, select
+from sqlalchemy.orm import Session
+
+from schemas import ProductColumns
+from .models import ProductMetricsDB, EMBEDDING_DIMENSIONS
+
+# Every product_metrics column except the embedding
+PRODUCT_COLUMNS = [
+    column for column in ProductMetricsDB.__table__.columns if column.name != "embedding"
+]
+
+# Binary COPY framing: 11-byte signature, int32 flags, int32 extension length
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_COPY_HEADER_SIZE = len(_COPY_SIGNATURE) + 8
+
+
+def _copy_row_dtype(dimensions: int) -> np.dtype:
+    """
+    Layout of one ``(id int4, embedding vector)`` tuple in binary COPY output.
+
+    pgvector sends a vector as int16 dim, int16 unused, then dim big-endian
+    float4 values, so every tuple has the same size and the whole stream can
+    be viewed as a structured array.
+    """
+    return np.dtype(
+        [
+            ("field_count", ">i2"),
+            ("id_length", ">i4"),
+            ("id", ">i4"),
+            ("embedding_length", ">i4"),
+            ("dimensions", ">i2"),
+            ("unused", ">i2"),
+            ("values", ">f4", (dimensions,)),
+        ]
+    )
+
+
+def load_embedding_matrix(
+    session: Session,
+    request_id: int,
+    dimensions: int = EMBEDDING_DIMENSIONS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load a request's product ids and embeddings without building ORM objects.
+
+    Uses a binary ``COPY`` (psycopg2) decoded in one pass by NumPy, and falls
+    back to an ``(id, embedding)`` column projection on other drivers.
+
+    Args:
+        session: Open session; the read joins its transaction
+        request_id: Request whose products to load
+        dimensions: Embedding size
+
+    Returns:
+        Tuple of (ids int64 array, float32 matrix of shape (n, dimensions)),
+        both ordered by product id
+    """
+    cursor = session.connection().connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            return _copy_embedding_matrix(cursor, request_id, dimensions)
+    finally:
+        cursor.close()
+
+    rows = session.execute(
+        select(ProductMetricsDB.id, ProductMetricsDB.embedding)
+        .where(
+            ProductMetricsDB.request_id == request_id,
+            ProductMetricsDB.embedding.is_not(None),
+        )
+        .order_by(ProductMetricsDB.id)
+    ).all()
+
+    ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+    matrix = np.empty((len(rows), dimensions), dtype=np.float32)
+    for index, row in enumerate(rows):
+        matrix[index] = row.embedding
+    return ids, matrix
+
+
+def _copy_embedding_matrix(
+    cursor, request_id: int, dimensions: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Read ``(id, embedding)`` through ``COPY ... (FORMAT BINARY)``."""
+    buffer = io.BytesIO()
+    cursor.copy_expert(
+        "COPY (SELECT id, embedding FROM product_metrics "
+        f"WHERE request_id = {int(request_id)} AND embedding IS NOT NULL "
+        "ORDER BY id) TO STDOUT WITH (FORMAT BINARY)",
+        buffer,
+    )
+    return decode_copy_embeddings(buffer.getbuffer(), dimensions)
+
+
+def decode_copy_embeddings(
+    data: memoryview | bytes, dimensions: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode binary COPY output of ``(id int4, embedding vector)`` rows."""
+    if bytes(data[: len(_COPY_SIGNATURE)]) != _COPY_SIGNATURE:
+        raise ValueError("Not a binary COPY stream")
+
+    extension_length = int.from_bytes(data[_COPY_HEADER_SIZE - 4 : _COPY_HEADER_SIZE], "big")
+    start = _COPY_HEADER_SIZE + extension_length
+    # Stream ends with an int16 -1 trailer
+    end = len(data) - 2
+
+    row_dtype = _copy_row_dtype(dimensions)
+    if (end - start) % row_dtype.itemsize:
+        raise ValueError(f"COPY rows don't match {dimensions}-dimension embeddings")
+
+    records = np.frombuffer(data[start:end], dtype=row_dtype)
+    if records.size and (records["dimensions"] != dimensions).any():
+        raise ValueError(f"Stored embeddings don't have {dimensions} dimensions")
+
+    ids = records["id"].astype(np.int64)
+    matrix = records["values"].astype(np.float32)
+    return ids, matrix
+
+
+def load_products(session: Session, ids: Iterable[int]) -> Dict[int, Row]:
+    """
+    Load every column but the embedding for the given product ids.
+
+    Returns plain rows keyed by id; they expose the same attribute names as
+    ``ProductMetricsDB`` and can be passed to ``product_from_db``.
+    """
+    ids = [int(pid) for pid in ids]
+    if not ids:
+        return {}
+
+    rows = session.execute(select(*PRODUCT_COLUMNS).where(ProductMetricsDB.id.in_(ids))).all()
+    return {row.id: row for row in rows}
+
+
+def load_product_columns(
+    session: Session,
+    request_id: Optional[int] = None,
+    after_id: int = 0,
+    limit: Optional[int] = None,
+) -> Tuple[np.ndarray, ProductColumns]:
+    """
+    Load scoring and analytics fields as NumPy columns, ordered by id.
+
+    Args:
+        session: Open session
+        request_id: Restrict to one request (default: whole table)
+        after_id: Only ids greater than this, for keyset pagination
+        limit: Maximum number of rows
+
+    Returns:
+        Tuple of (ids int64 array, ProductColumns)
+    """
+    stmt = (
+        select(
+            ProductMetricsDB.id,
+            ProductMetricsDB.price,
+            ProductMetricsDB.rating,
+            ProductMetricsDB.review_count,
+            ProductMetricsDB.sales_last_month,
+            ProductMetricsDB.search_ranking,
+            ProductMetricsDB.sponsored,
+            func.char_length(ProductMetricsDB.description),
+            ProductMetricsDB.score,
+        )
+        .where(ProductMetricsDB.id > after_id)
+        .order_by(ProductMetricsDB.id)
+    )
+    if request_id is not None:
+        stmt = stmt.where(ProductMetricsDB.request_id == request_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    rows = session.execute(stmt).all()
+    fields = list(zip(*rows)) if rows else [()] * 9
+
+    def column(index: int) -> np.ndarray:
+        return np.array(fields[index], dtype=np.float64)
+
+    columns = ProductColumns(
+        price=column(1),
+        rating=column(2),
+        review_count=column(3),
+        sales_last_month=column(4),
+        search_ranking=column(5),
+        sponsored=np.array([bool(v) for v in fields[6]], dtype=bool),
+        description_length=np.array([v or 0 for v in fields[7]], dtype=np.int64),
+        score=column(8),
+    )
+    return np.array(fields[0], dtype=np.int64), columns
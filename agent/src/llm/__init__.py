@@ -1,8 +1,18 @@
 """LLM utilities module."""
 
-from .models import get_chat_model, get_embeddings_model
+from .models import (
+    get_chat_model,
+    get_embeddings_model,
+    get_embeddings_model_name,
+    BatchedEmbeddings,
+)
+from .local import HashingEmbeddings, SentenceTransformerEmbeddings
 
 __all__ = [
     "get_chat_model",
     "get_embeddings_model",
+    "get_embeddings_model_name",
+    "BatchedEmbeddings",
+    "HashingEmbeddings",
+    "SentenceTransformerEmbeddings",
 ]
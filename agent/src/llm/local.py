@@ -0,0 +1,94 @@
+"""
+Local CPU embedding backends.
+
+These run without network access, which makes them suitable for bulk
+backfills, offline development and tests.
+"""
+
+from typing import Any, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Stateless hashed TF encoder.
+
+    Word uni/bigrams and character 3-5 grams are hashed into the same
+    ``dimensions`` buckets, log-scaled and L2-normalised. No fitting is
+    needed, so the same text always maps to the same vector.
+    """
+
+    def __init__(self, dimensions: int, char_weight: float = 0.5):
+        self.dimensions = dimensions
+        self.char_weight = char_weight
+        self._word_vectorizer = HashingVectorizer(
+            n_features=dimensions,
+            ngram_range=(1, 2),
+            stop_words="english",
+            norm=None,
+        )
+        self._char_vectorizer = HashingVectorizer(
+            n_features=dimensions,
+            analyzer="char_wb",
+            ngram_range=(3, 5),
+            norm=None,
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents."""
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query text."""
+        return self.encode([text])[0].tolist()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into an L2-normalised float32 matrix."""
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+
+        word: Any = self._word_vectorizer.transform(texts)
+        char: Any = self._char_vectorizer.transform(texts)
+        combined = word + char * self.char_weight
+
+        # Sublinear TF keeps repeated tokens from dominating (sign preserved)
+        combined.data = np.sign(combined.data) * np.log1p(np.abs(combined.data))
+
+        return normalize(combined).toarray().astype(np.float32)
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """Small sentence-embedding model run locally on CPU."""
+
+    def __init__(self, model_name: str, dimensions: int):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            raise ImportError(
+                "The 'sentence-transformers' embeddings backend needs the "
+                "sentence-transformers package: pip install sentence-transformers"
+            ) from exc
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+        model_dimensions = self.model.get_sentence_embedding_dimension()
+        if model_dimensions != dimensions:
+            raise ValueError(
+                f"{model_name} produces {model_dimensions}-d vectors but "
+                f"EMBEDDING_DIMENSIONS is {dimensions}"
+            )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents."""
+        if not texts:
+            return []
+        vectors = self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.astype(np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query text."""
+        return self.embed_documents([text])[0]
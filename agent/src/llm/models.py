@@ -2,11 +2,99 @@
 LLM model initialization.
 """
 
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import List
 
+import tiktoken
+from langchain_core.embeddings import Embeddings
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from openai import RateLimitError
 
 from config import get_settings
+from config.constants import EMBEDDING_CONFIG, EmbeddingConfig
+from .local import HashingEmbeddings, SentenceTransformerEmbeddings
+
+
+class BatchedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that packs texts into token-budgeted batches.
+
+    Batches are sent concurrently (up to ``MAX_CONCURRENT_BATCHES``),
+    retried with exponential backoff on rate limits, and reassembled
+    in input order.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        model_name: str,
+        config: EmbeddingConfig = EMBEDDING_CONFIG,
+    ):
+        self.underlying = underlying
+        self.config = config
+        try:
+            self.encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    def make_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into consecutive batches within the token and input limits."""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for text in texts:
+            tokens = len(self.encoding.encode(text, disallowed_special=()))
+            if current and (
+                current_tokens + tokens > self.config.BATCH_MAX_TOKENS
+                or len(current) >= self.config.BATCH_MAX_INPUTS
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+
+            current.append(text)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents batch by batch, preserving input order."""
+        batches = self.make_batches(texts)
+        if len(batches) <= 1:
+            return [v for batch in batches for v in self._embed_batch(batch)]
+
+        max_workers = min(self.config.MAX_CONCURRENT_BATCHES, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(self._embed_batch, batches)
+            return [vector for batch_vectors in results for vector in batch_vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query text."""
+        return self._with_backoff(lambda: self.underlying.embed_query(text))
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one batch with rate-limit retries."""
+        return self._with_backoff(lambda: self.underlying.embed_documents(batch))
+
+    def _with_backoff(self, call):
+        """Run call, retrying on HTTP 429 with jittered exponential backoff."""
+        for attempt in range(self.config.MAX_RETRIES + 1):
+            try:
+                return call()
+            except RateLimitError:
+                if attempt == self.config.MAX_RETRIES:
+                    raise
+                delay = min(
+                    self.config.RETRY_MAX_DELAY_SECONDS,
+                    self.config.RETRY_BASE_DELAY_SECONDS * (2**attempt),
+                )
+                time.sleep(delay * random.uniform(0.5, 1.0))
 
 
 @lru_cache
@@ -21,10 +109,62 @@ def get_chat_model() -> ChatOpenAI:
 
 
 @lru_cache
-def get_embeddings_model() -> OpenAIEmbeddings:
-    """Get the embeddings model instance."""
+def get_embeddings_model() -> Embeddings:
+    """
+    Get the embeddings model instance.
+
+    The backend is chosen by ``Settings.embeddings_backend``. OpenAI
+    requests are token-batched and sent concurrently. The persistent
+    embedding cache is applied by the ingestion service
+    (``get_cached_embeddings_model``).
+    """
     settings = get_settings()
-    return OpenAIEmbeddings(
-        model=settings.embeddings_model,
-        api_key=settings.openai_api_key,
-    )
+    backend = settings.embeddings_backend
+
+    if backend == "hashing":
+        return HashingEmbeddings(dimensions=settings.embedding_dimensions)
+
+    model: Embeddings
+    if backend == "openai":
+        model_name = settings.embeddings_model
+        model = BatchedEmbeddings(
+            OpenAIEmbeddings(
+                model=model_name,
+                api_key=settings.openai_api_key,
+                # Our batches already respect the API limits; don't re-split them
+                chunk_size=EMBEDDING_CONFIG.BATCH_MAX_INPUTS,
+                # Only the text-embedding-3 family accepts a custom size
+                dimensions=(
+                    settings.embedding_dimensions
+                    if model_name.startswith("text-embedding-3")
+                    else None
+                ),
+            ),
+            model_name=model_name,
+        )
+    elif backend == "sentence-transformers":
+        model_name = settings.local_embeddings_model
+        model = SentenceTransformerEmbeddings(
+            model_name, dimensions=settings.embedding_dimensions
+        )
+    else:
+        raise ValueError(f"Unknown embeddings backend: {backend!r}")
+
+    return model
+
+
+def get_embeddings_model_name() -> str:
+    """
+    Identify the configured embeddings (backend, model and size).
+
+    Vectors are only interchangeable between models with the same name.
+    """
+    settings = get_settings()
+    backend = settings.embeddings_backend
+    if backend == "openai":
+        model_name = settings.embeddings_model
+    elif backend == "sentence-transformers":
+        model_name = settings.local_embeddings_model
+    else:
+        model_name = backend
+    return f"{backend}:{model_name}:{settings.embedding_dimensions}"
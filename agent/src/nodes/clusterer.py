@@ -3,98 +3,112 @@ Clusterer node - clusters products and analyzes trends.
 """
 
 from collections import defaultdict
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
-from sklearn.cluster import DBSCAN
+import numpy as np
+from sqlalchemy import Row, select, update
+from sqlalchemy.orm import Session
 
 from core.state import GraphState
-from schemas import ProductMetrics, ProductCluster
+from schemas import ProductCluster, ProductColumns, SearchCriteria
 from config.constants import CLUSTERER_CONFIG
 from services.clustering import (
     ClusterAnalyticsService,
     ClusterKeywordExtractor,
+    CentroidIndex,
+    compute_centroid,
+    reduce_embeddings,
+    get_clustering_engine,
+    KeywordCorpusUpdate,
+    merge_keyword_corpus,
+    update_keyword_corpus,
+    warm_keyword_corpus,
 )
-from services.external import get_trends
+from services.external import get_search_series
 from database import (
     get_db,
     get_session_factory,
     ProductMetricsDB,
     ProductClustersDB,
+    product_from_db,
+    load_embedding_matrix,
+    load_products,
 )
 
 
+@dataclass
+class _ClusterGroup:
+    """Matrix rows forming one cluster of this request."""
+
+    label: int
+    rows: List[int]
+    trend_keywords: List[str]
+    # Index into CentroidIndex.clusters when joining an existing niche
+    parent_index: int = -1
+
+
 def cluster_node(state: GraphState) -> GraphState:
     """
     Cluster products and analyze trends.
 
     This node:
-    1. Retrieves product embeddings from database
-    2. Clusters using DBSCAN
-    3. Extracts keywords for each cluster
-    4. Fetches trend data
-    5. Computes analytics
-    6. Saves clusters to database
+    1. Loads the request's embedding matrix
+    2. In incremental mode, assigns products to stored niches by centroid
+    3. Clusters the remaining products with the configured engine
+    4. Loads the clustered products and extracts keywords for each new cluster
+    5. Fetches search series for all clusters (per-keyword, cached)
+    6. Computes analytics
+    7. Saves clusters (and updated centroids) to database
     """
     print("--- STEP 3: CLUSTERING PRODUCTS ---")
 
     SessionLocal = get_session_factory()
 
     with SessionLocal() as session:
-        # Fetch products
-        db_products = session.query(ProductMetricsDB).filter_by(request_id=state.request_id).all()
-
-        if not db_products:
+        ids, embeddings = _embedding_matrix(session, state)
+        if embeddings.shape[0] == 0:
             return state
+        state.embeddings = embeddings
 
-        embeddings = [p.embedding for p in db_products]
-        if not embeddings:
-            return state
-
-        # Cluster using DBSCAN
-        clustering_model = DBSCAN(
-            eps=CLUSTERER_CONFIG.DBSCAN_EPS,
-            min_samples=CLUSTERER_CONFIG.DBSCAN_MIN_SAMPLES,
-            metric=CLUSTERER_CONFIG.DBSCAN_METRIC,
-        )
-        labels = clustering_model.fit_predict(embeddings)
+        centroid_index = CentroidIndex(CLUSTERER_CONFIG)
+        if CLUSTERER_CONFIG.INCREMENTAL:
+            centroid_index.load(session, state.search_criteria)
 
-        # Extract keywords
-        keyword_extractor = ClusterKeywordExtractor()
-        cluster_keywords = keyword_extractor.label_all_clusters(
-            [p.description for p in db_products], labels
-        )
+        groups = _group_products(embeddings, centroid_index)
 
-        # Group products by cluster
-        clusters_map: dict[int, List[ProductMetricsDB]] = defaultdict(list)
-        for product, label in zip(db_products, labels):
-            if label != -1:  # Exclude noise
-                clusters_map[int(label)].append(product)
+        # Only clustered rows need their other columns
+        db_products = _clustered_products(session, ids, groups)
+        _label_new_groups(session, ids, groups, db_products, state.search_criteria)
 
         # Initialize services
         analytics_service = ClusterAnalyticsService()
 
-        # Process each cluster
-        for label, cluster_products in clusters_map.items():
-            # Get keywords
-            trend_keywords = [keyword for keyword, _ in cluster_keywords[label]["keywords"]]
+        # Fetch search series for all clusters; only uncached keywords hit the API
+        search_series = _fetch_search_series(groups, state.search_criteria)
+
+        # Compute analytics for all clusters in one pass, keyed by group index
+        clustered_rows = [db_products[row] for group in groups for row in group.rows]
+        group_labels = np.repeat(np.arange(len(groups)), [len(group.rows) for group in groups])
+        all_analytics = analytics_service.compute_batch(
+            ProductColumns.from_products(clustered_rows),
+            group_labels,
+            search_series=dict(enumerate(search_series)),
+        )
 
-            # Fetch trend data
-            keywords_to_query = trend_keywords[: CLUSTERER_CONFIG.CLUSTER_KEYWORDS_LIMIT]
-            trend_response = get_trends(keywords_to_query) if keywords_to_query else None
+        # Process each cluster
+        absorbed: Dict[int, np.ndarray] = {}
+        for index, group in enumerate(groups):
+            label, rows, trend_keywords = group.label, group.rows, group.trend_keywords
 
             # Build state cluster
+            analytics = all_analytics[index]
             state_cluster = ProductCluster(
                 label=label,
                 trend_keywords=trend_keywords,
-                products=[_db_to_schema(p) for p in cluster_products],
-            )
-
-            # Compute analytics
-            analytics = analytics_service.compute_analytics(
-                state_cluster.products,
-                trend_response,
+                products=[product_from_db(db_products[row], row) for row in rows],
+                analytics=analytics,
             )
-            state_cluster.analytics = analytics
 
             state.clusters.append(state_cluster)
 
@@ -123,47 +137,226 @@ def cluster_node(state: GraphState) -> GraphState:
                 trend_sales_volume=trend_data.sales_volume if trend_data else 0,
                 trend_saturation_ratio=trend_data.saturation_ratio if trend_data else 0,
             )
+
+            if group.parent_index >= 0:
+                # Joined an existing niche: move its centroid instead
+                db_cluster.parent_cluster_id = centroid_index.clusters[group.parent_index].id
+                db_cluster.centroid_size = 0
+                absorbed[group.parent_index] = embeddings[rows]
+            else:
+                db_cluster.centroid = compute_centroid(embeddings[rows])
+                db_cluster.centroid_size = len(rows)
+
             session.add(db_cluster)
             session.flush()
 
             # Update product cluster references
-            for product in cluster_products:
-                product.cluster_id = db_cluster.id
+            session.execute(
+                update(ProductMetricsDB)
+                .where(ProductMetricsDB.id.in_([int(ids[row]) for row in rows]))
+                .values(cluster_id=db_cluster.id)
+            )
 
             state.cluster_ids.append(db_cluster.id)
 
+        # Niche centroids are locked until the commit
+        centroid_index.absorb(session, absorbed)
+
+        # Counted in the same transaction, so a request is in the corpus
+        # exactly when its clusters are saved
+        corpus_update = None
+        if CLUSTERER_CONFIG.KEYWORD_IDF_SCOPE == "corpus":
+            corpus_update = _update_keyword_corpus(session, state)
+
         session.commit()
 
+        if corpus_update is not None:
+            merge_keyword_corpus(corpus_update)
+
     return state
 
 
-def _db_to_schema(db_product: ProductMetricsDB) -> ProductMetrics:
-    """Convert database product to schema."""
-    from schemas import Platforms, Currencies
-
-    return ProductMetrics(
-        keyword_searched=db_product.keyword_searched,
-        platform=(
-            Platforms(db_product.platform)
-            if db_product.platform in [p.value for p in Platforms]
-            else Platforms.UNKNOWN
-        ),
-        unique_id=db_product.unique_id,
-        description=db_product.description,
-        price=db_product.price,
-        currency=(
-            Currencies(db_product.currency)
-            if db_product.currency in [c.value for c in Currencies]
-            else Currencies.UNKNOWN
-        ),
-        image_url=db_product.image_url,
-        platform_category=db_product.platform_category,
-        platform_region=db_product.platform_region,
-        rating=db_product.rating,
-        review_count=db_product.review_count,
-        sales_last_month=db_product.sales_last_month,
-        search_ranking=db_product.search_ranking,
-        sponsored=db_product.sponsored,
-        score=db_product.score,
-        embedding=list(db_product.embedding) if db_product.embedding is not None else [],
+def _group_products(
+    embeddings: np.ndarray,
+    centroid_index: CentroidIndex,
+) -> List[_ClusterGroup]:
+    """
+    Split matrix rows into clusters.
+
+    Rows assigned to a stored niche reuse its keywords; groups smaller than
+    DBSCAN_MIN_SAMPLES are not kept and go back into the pool. Everything
+    else is clustered from scratch; those groups are returned without
+    keywords (see ``_label_new_groups``).
+    """
+    min_samples = CLUSTERER_CONFIG.DBSCAN_MIN_SAMPLES
+    assignments = centroid_index.assign(embeddings)
+
+    matched: dict[int, List[int]] = defaultdict(list)
+    leftover: List[int] = []
+    for row, index in enumerate(assignments):
+        if index >= 0:
+            matched[int(index)].append(row)
+        else:
+            leftover.append(row)
+
+    existing: List[_ClusterGroup] = []
+    for index, rows in matched.items():
+        if len(rows) < min_samples:
+            leftover.extend(rows)
+            continue
+        existing.append(
+            _ClusterGroup(
+                label=-1,
+                rows=rows,
+                trend_keywords=centroid_index.clusters[index].trend_keywords,
+                parent_index=index,
+            )
+        )
+
+    groups: List[_ClusterGroup] = []
+    if leftover:
+        leftover.sort()
+        # Avoid copying the matrix when nothing was assigned
+        pool = embeddings if len(leftover) == embeddings.shape[0] else embeddings[leftover]
+
+        clustering_engine = get_clustering_engine(CLUSTERER_CONFIG)
+        labels = clustering_engine.fit_predict(reduce_embeddings(pool, CLUSTERER_CONFIG))
+
+        # Group matrix rows by cluster
+        clusters_map: dict[int, List[int]] = defaultdict(list)
+        for row, label in zip(leftover, labels):
+            if label != -1:  # Exclude noise
+                clusters_map[int(label)].append(row)
+
+        for label, rows in clusters_map.items():
+            groups.append(_ClusterGroup(label=label, rows=rows, trend_keywords=[]))
+
+    # Niche assignments are numbered after the freshly found clusters
+    next_label = max((g.label for g in groups), default=-1) + 1
+    for offset, group in enumerate(existing):
+        group.label = next_label + offset
+
+    return groups + existing
+
+
+def _label_new_groups(
+    session: Session,
+    ids: np.ndarray,
+    groups: List[_ClusterGroup],
+    db_products: Dict[int, Row],
+    criteria: SearchCriteria,
+) -> None:
+    """
+    Extract trend keywords for groups that didn't join a stored niche.
+
+    With KEYWORD_IDF_SCOPE="request" the IDF is fitted on every description
+    of the request (noise and rows that joined a niche included), but only
+    the new groups are labelled.
+    """
+    new_groups = [g for g in groups if g.parent_index < 0]
+    if not new_groups:
+        return
+
+    idf_scope = CLUSTERER_CONFIG.KEYWORD_IDF_SCOPE
+    corpus = None
+    if idf_scope == "corpus":
+        corpus = warm_keyword_corpus(criteria.vertical_category, criteria.target_region)
+        if corpus is None:
+            # Corpus still cold: fit on this request instead
+            idf_scope = "request"
+
+    if idf_scope == "request":
+        texts = _request_descriptions(session, ids, db_products)
+        labels = np.full(len(ids), -1)
+        for group in new_groups:
+            labels[group.rows] = group.label
+    else:
+        texts = []
+        label_list: List[int] = []
+        for group in new_groups:
+            for row in group.rows:
+                texts.append(db_products[row].description)
+                label_list.append(group.label)
+        labels = np.array(label_list)
+
+    keyword_extractor = ClusterKeywordExtractor()
+    cluster_keywords = keyword_extractor.label_all_clusters(
+        texts, labels, idf_scope=idf_scope, corpus=corpus
     )
+
+    for group in new_groups:
+        group.trend_keywords = [keyword for keyword, _ in cluster_keywords[group.label]["keywords"]]
+
+
+def _request_descriptions(
+    session: Session, ids: np.ndarray, db_products: Dict[int, Row]
+) -> List[str]:
+    """Description of every matrix row; rows outside a cluster are read here."""
+    missing = [int(ids[row]) for row in range(len(ids)) if row not in db_products]
+    descriptions: Dict[int, str] = {}
+    if missing:
+        descriptions = dict(
+            session.execute(
+                select(ProductMetricsDB.id, ProductMetricsDB.description).where(
+                    ProductMetricsDB.id.in_(missing)
+                )
+            ).all()
+        )
+    return [
+        db_products[row].description if row in db_products else descriptions[int(ids[row])]
+        for row in range(len(ids))
+    ]
+
+
+def _update_keyword_corpus(
+    session: Session, state: GraphState
+) -> Optional[KeywordCorpusUpdate]:
+    """Add every description of this request to its vertical/region keyword corpus."""
+    descriptions = session.scalars(
+        select(ProductMetricsDB.description).where(
+            ProductMetricsDB.request_id == state.request_id
+        )
+    ).all()
+    return update_keyword_corpus(
+        session,
+        state.search_criteria.vertical_category,
+        state.search_criteria.target_region,
+        ClusterKeywordExtractor().tokenize(list(descriptions)),
+    )
+
+
+def _fetch_search_series(
+    groups: List[_ClusterGroup], criteria: SearchCriteria
+) -> List[Optional[List[float]]]:
+    """Summed search series for each group, in group order (None without keywords)."""
+    return get_search_series(
+        [group.trend_keywords[: CLUSTERER_CONFIG.CLUSTER_KEYWORDS_LIMIT] for group in groups],
+        criteria.target_region,
+    )
+
+
+def _clustered_products(
+    session: Session, ids: np.ndarray, groups: List[_ClusterGroup]
+) -> Dict[int, Row]:
+    """Load product columns for the rows that ended up in a cluster, keyed by row."""
+    rows = [row for group in groups for row in group.rows]
+    by_id = load_products(session, ids[rows])
+    return {row: by_id[int(ids[row])] for row in rows}
+
+
+def _embedding_matrix(session: Session, state: GraphState) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the request's product ids and float32 embedding matrix.
+
+    Reuses the scraper's matrix without copying when it covers exactly the
+    request's products; otherwise reads it from the database in bulk.
+    """
+    ids = state.scraped_products_id
+    if state.embeddings is not None and len(ids) == state.embeddings.shape[0]:
+        stored = session.scalars(
+            select(ProductMetricsDB.id).where(ProductMetricsDB.request_id == state.request_id)
+        ).all()
+        if len(stored) == len(ids) and set(stored) == set(ids):
+            return np.asarray(ids, dtype=np.int64), state.embeddings
+
+    return load_embedding_matrix(session, state.request_id)
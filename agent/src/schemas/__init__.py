@@ -6,17 +6,20 @@ This ensures no circular imports.
 """
 
 from .enums import Platforms, Currencies
-from .products import ProductMetrics
+from .products import ProductMetrics, SimilarProduct
 from .search import SearchCriteria
 from .clusters import ProductCluster
 from .analytics import ClusterAnalyticsData, TrendAnalyticsData
+from .columns import ProductColumns
 
 __all__ = [
     "Platforms",
     "Currencies",
     "ProductMetrics",
+    "SimilarProduct",
     "SearchCriteria",
     "ProductCluster",
     "ClusterAnalyticsData",
     "TrendAnalyticsData",
+    "ProductColumns",
 ]
@@ -0,0 +1,50 @@
+"""
+Columnar product data for vectorized scoring and analytics.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+
+
+@dataclass
+class ProductColumns:
+    """
+    Product fields as parallel NumPy arrays, one entry per product.
+
+    Numeric columns are float64 so missing values can be stored as NaN;
+    integer fields are still exact at that precision.
+    """
+
+    price: np.ndarray
+    rating: np.ndarray
+    review_count: np.ndarray
+    sales_last_month: np.ndarray
+    search_ranking: np.ndarray
+    sponsored: np.ndarray
+    description_length: np.ndarray
+    score: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @classmethod
+    def from_products(cls, products: Sequence[Any]) -> "ProductColumns":
+        """Build columns from product-like objects (None becomes NaN)."""
+
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(p, name) for p in products], dtype=np.float64)
+
+        return cls(
+            price=column("price"),
+            rating=column("rating"),
+            review_count=column("review_count"),
+            sales_last_month=column("sales_last_month"),
+            search_ranking=column("search_ranking"),
+            sponsored=np.array([bool(p.sponsored) for p in products], dtype=bool),
+            description_length=np.array(
+                [len(p.description or "") for p in products], dtype=np.int64
+            ),
+            score=column("score"),
+        )
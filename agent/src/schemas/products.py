@@ -2,8 +2,7 @@
 Product-related data schemas.
 """
 
-from typing import List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from .enums import Platforms, Currencies
 
@@ -33,9 +32,21 @@ class ProductMetrics(BaseModel):
 
     # Computed values
     score: float = 0.0
-    embedding: List[float] = Field(default_factory=list)
+    # Row in the request's float32 embedding matrix (GraphState.embeddings);
+    # -1 until the product has been embedded
+    embedding_row: int = -1
 
     class Config:
         """Pydantic configuration."""
 
         use_enum_values = True
+
+
+class SimilarProduct(BaseModel):
+    """A stored product returned by a similarity search."""
+
+    product_id: int
+    request_id: int
+    # Cosine distance to the query (0 = identical direction)
+    distance: float
+    product: ProductMetrics
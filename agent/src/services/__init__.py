@@ -3,6 +3,8 @@
 from .scoring import ProductScorer, TrendScorer, calculate_product_score
 from .clustering import ClusterAnalyticsService, ClusterKeywordExtractor
 from .external import ApifyService, DataForSEOService
+from .ingestion import ProductIngestionPipeline
+from .similarity import SimilarProductsService
 
 __all__ = [
     "ProductScorer",
@@ -12,4 +14,6 @@ __all__ = [
     "ClusterKeywordExtractor",
     "ApifyService",
     "DataForSEOService",
+    "ProductIngestionPipeline",
+    "SimilarProductsService",
 ]
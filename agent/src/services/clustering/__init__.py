@@ -2,8 +2,34 @@
 
 from .analytics import ClusterAnalyticsService
 from .keyword_extractor import ClusterKeywordExtractor
+from .keyword_corpus import (
+    KeywordCorpus,
+    KeywordCorpusStore,
+    KeywordCorpusUpdate,
+    get_keyword_corpus,
+    merge_keyword_corpus,
+    update_keyword_corpus,
+    warm_keyword_corpus,
+)
+from .engines import ClusteringEngine, get_clustering_engine
+from .incremental import CentroidIndex, compute_centroid
+from .reduction import EmbeddingReducer, reduce_embeddings, evaluate_reduction
 
 __all__ = [
     "ClusterAnalyticsService",
     "ClusterKeywordExtractor",
+    "KeywordCorpus",
+    "KeywordCorpusStore",
+    "KeywordCorpusUpdate",
+    "get_keyword_corpus",
+    "merge_keyword_corpus",
+    "update_keyword_corpus",
+    "warm_keyword_corpus",
+    "ClusteringEngine",
+    "get_clustering_engine",
+    "CentroidIndex",
+    "compute_centroid",
+    "EmbeddingReducer",
+    "reduce_embeddings",
+    "evaluate_reduction",
 ]
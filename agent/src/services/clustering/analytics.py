@@ -5,10 +5,12 @@ Computes statistical metrics for product clusters.
 """
 
 from statistics import mean
-from typing import Protocol, Any, Sequence
+from typing import Dict, Mapping, Protocol, Any, Optional, Sequence, Tuple
 
-from schemas import ClusterAnalyticsData, TrendAnalyticsData
-from services.scoring import TrendScorer
+import numpy as np
+
+from schemas import ClusterAnalyticsData, TrendAnalyticsData, ProductColumns
+from services.scoring import TrendScorer, stack_series
 
 
 class ProductLike(Protocol):
@@ -37,6 +39,7 @@ class ClusterAnalyticsService:
         self,
         products: Sequence[ProductLike],
         trends_response: Any = None,
+        search_series: Optional[Sequence[float]] = None,
     ) -> ClusterAnalyticsData:
         """
         Compute analytics for a cluster of products.
@@ -44,6 +47,8 @@ class ClusterAnalyticsService:
         Args:
             products: List of products in the cluster
             trends_response: Optional response from DataForSEO trends API
+            search_series: Optional summed search series; used instead of
+                ``trends_response`` when given
 
         Returns:
             ClusterAnalyticsData with computed metrics
@@ -65,7 +70,13 @@ class ClusterAnalyticsService:
 
         # Compute trend analytics if we have trend data
         trend_analytics = None
-        if trends_response:
+        if search_series is not None:
+            trend_analytics = self.trend_scorer.analyze_series(
+                search_series=search_series,
+                average_sales=avg_sales,
+                average_reviews=avg_reviews,
+            )
+        elif trends_response:
             trend_analytics = self.trend_scorer.analyze(
                 trends_response=trends_response,
                 average_sales=avg_sales,
@@ -84,3 +95,90 @@ class ClusterAnalyticsService:
             average_product_score=round(mean(scores), 2) if scores else 0.0,
             trend_analytics=trend_analytics,
         )
+
+    def compute_batch(
+        self,
+        columns: ProductColumns,
+        labels: np.ndarray,
+        search_series: Mapping[int, Optional[Sequence[float]]] | None = None,
+    ) -> Dict[int, ClusterAnalyticsData]:
+        """
+        Compute analytics for every cluster in one vectorized group-by pass.
+
+        Gives the same values as ``compute_analytics`` per cluster (up to
+        float summation order). Missing values (NaN) are masked out.
+
+        Args:
+            columns: Product columns, one entry per product
+            labels: Cluster label per product (-1 = noise, skipped)
+            search_series: Optional summed search series per label
+
+        Returns:
+            Dict mapping cluster label -> ClusterAnalyticsData
+        """
+        labels = np.asarray(labels)
+        keep = labels != -1
+        cluster_labels, groups = np.unique(labels[keep], return_inverse=True)
+        n_clusters = len(cluster_labels)
+        if n_clusters == 0:
+            return {}
+
+        sizes = np.bincount(groups, minlength=n_clusters)
+
+        def group_mean(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """Per-cluster count of present values and their mean."""
+            values = values[keep]
+            present = ~np.isnan(values)
+            counts = np.bincount(groups[present], minlength=n_clusters)
+            sums = np.bincount(groups[present], weights=values[present], minlength=n_clusters)
+            means = np.divide(sums, counts, out=np.zeros(n_clusters), where=counts > 0)
+            return counts, means
+
+        price_counts, price_means = group_mean(columns.price)
+        sales_counts, sales_means = group_mean(columns.sales_last_month)
+        rating_counts, rating_means = group_mean(columns.rating)
+        review_counts, review_means = group_mean(columns.review_count)
+        rank_counts, rank_means = group_mean(columns.search_ranking)
+        score_counts, score_means = group_mean(columns.score)
+
+        prices = columns.price[keep]
+        present = ~np.isnan(prices)
+        min_prices = np.full(n_clusters, np.inf)
+        max_prices = np.full(n_clusters, -np.inf)
+        np.minimum.at(min_prices, groups[present], prices[present])
+        np.maximum.at(max_prices, groups[present], prices[present])
+
+        avg_sales = [int(round(m)) if c else 0 for c, m in zip(sales_counts, sales_means)]
+        avg_reviews = [int(round(m)) if c else 0 for c, m in zip(review_counts, review_means)]
+
+        # Trend analytics for clusters that have search data, in one batch
+        trends: Dict[int, TrendAnalyticsData] = {}
+        if search_series:
+            indexes = [
+                i
+                for i, label in enumerate(cluster_labels)
+                if search_series.get(int(label)) is not None
+            ]
+            if indexes:
+                batch = self.trend_scorer.analyze_batch(
+                    stack_series([search_series[int(cluster_labels[i])] for i in indexes]),
+                    [avg_sales[i] for i in indexes],
+                    [avg_reviews[i] for i in indexes],
+                )
+                trends = dict(zip(indexes, batch.to_analytics()))
+
+        return {
+            int(label): ClusterAnalyticsData(
+                cluster_size=int(sizes[i]),
+                min_price=float(min_prices[i]) if price_counts[i] else 0.0,
+                max_price=float(max_prices[i]) if price_counts[i] else 0.0,
+                average_price=round(float(price_means[i]), 2) if price_counts[i] else 0.0,
+                average_sales_last_month=avg_sales[i],
+                average_rating=round(float(rating_means[i]), 2) if rating_counts[i] else 0.0,
+                average_review_count=avg_reviews[i],
+                average_search_ranking=int(round(rank_means[i])) if rank_counts[i] else 0,
+                average_product_score=round(float(score_means[i]), 2) if score_counts[i] else 0.0,
+                trend_analytics=trends.get(i),
+            )
+            for i, label in enumerate(cluster_labels)
+        }
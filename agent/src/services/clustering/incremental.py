@@ -0,0 +1,159 @@
+"""
+Incremental clustering against stored cluster centroids.
+
+Products close to a niche found by an earlier request are assigned to it
+directly; only the remaining products need a fresh clustering pass.
+"""
+
+from dataclasses import dataclass
+from typing import List, Mapping
+
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import normalize
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from config.constants import CLUSTERER_CONFIG, ClustererConfig
+from database import ProductClustersDB, SearchCriteriaDB
+from schemas import SearchCriteria
+from .engines import cosine_to_euclidean_eps
+
+
+@dataclass
+class CanonicalCluster:
+    """A stored niche that new products can be assigned to."""
+
+    id: int
+    trend_keywords: List[str]
+    size: int
+
+
+class CentroidIndex:
+    """
+    Nearest-centroid lookup over canonical clusters.
+
+    Canonical clusters are ``product_clusters`` rows without a parent, from
+    requests with the same vertical category and region. Their centroid is
+    the running mean of their members' unit embeddings and is updated online
+    as new products join.
+    """
+
+    def __init__(self, config: ClustererConfig = CLUSTERER_CONFIG):
+        self.config = config
+        self.clusters: List[CanonicalCluster] = []
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self._neighbors: NearestNeighbors | None = None
+
+    def load(self, session: Session, criteria: SearchCriteria) -> "CentroidIndex":
+        """
+        Load the most recent canonical centroids matching the request's
+        vertical category and region (compared trimmed and lowercased).
+        """
+        rows = session.execute(
+            select(
+                ProductClustersDB.id,
+                ProductClustersDB.centroid,
+                ProductClustersDB.centroid_size,
+                ProductClustersDB.trend_keywords,
+            )
+            .join(SearchCriteriaDB, SearchCriteriaDB.request_id == ProductClustersDB.request_id)
+            .where(
+                ProductClustersDB.parent_cluster_id.is_(None),
+                ProductClustersDB.centroid.is_not(None),
+                func.lower(func.trim(SearchCriteriaDB.vertical_category))
+                == criteria.vertical_category.strip().lower(),
+                func.lower(func.trim(SearchCriteriaDB.target_region))
+                == criteria.target_region.strip().lower(),
+            )
+            .order_by(ProductClustersDB.id.desc())
+            .limit(self.config.INCREMENTAL_MAX_CENTROIDS)
+        ).all()
+
+        if not rows:
+            return self
+
+        self.clusters = [
+            CanonicalCluster(
+                id=row.id,
+                trend_keywords=list(row.trend_keywords),
+                size=row.centroid_size,
+            )
+            for row in rows
+        ]
+        self.centroids = np.array([row.centroid for row in rows], dtype=np.float32)
+        self._neighbors = NearestNeighbors(n_neighbors=1, n_jobs=self.config.N_JOBS).fit(
+            normalize(self.centroids)
+        )
+        return self
+
+    def assign(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Index into ``clusters`` of the nearest centroid for each row.
+
+        Rows farther than ``DBSCAN_EPS`` (cosine) from every centroid get -1.
+        """
+        if self._neighbors is None or embeddings.shape[0] == 0:
+            return np.full(embeddings.shape[0], -1, dtype=np.intp)
+
+        distances, indices = self._neighbors.kneighbors(normalize(embeddings))
+        within = distances[:, 0] <= cosine_to_euclidean_eps(self.config.DBSCAN_EPS)
+        return np.where(within, indices[:, 0], -1)
+
+    def absorb(self, session: Session, members: Mapping[int, np.ndarray]) -> None:
+        """
+        Fold new member embeddings into canonical centroids.
+
+        Args:
+            session: Session of the caller's transaction (not committed)
+            members: Index into ``clusters`` -> embeddings of the new members
+
+        The stored rows are locked (in id order, so concurrent requests
+        can't deadlock) and the update starts from their current centroid
+        and size, so members added by other requests since ``load`` are kept.
+        """
+        if not members:
+            return
+
+        ids = sorted(self.clusters[index].id for index in members)
+        stored = {
+            row.id: row
+            for row in session.execute(
+                select(
+                    ProductClustersDB.id,
+                    ProductClustersDB.centroid,
+                    ProductClustersDB.centroid_size,
+                )
+                .where(ProductClustersDB.id.in_(ids))
+                .order_by(ProductClustersDB.id)
+                .with_for_update()
+            )
+        }
+
+        for index, embeddings in members.items():
+            cluster = self.clusters[index]
+            row = stored.get(cluster.id)
+            if row is None or row.centroid is None:
+                # Deleted since load
+                continue
+
+            size = row.centroid_size
+            total = size + embeddings.shape[0]
+            centroid = (
+                np.asarray(row.centroid, dtype=np.float32) * size
+                + normalize(embeddings).sum(axis=0)
+            ) / total
+
+            self.centroids[index] = centroid
+            cluster.size = total
+
+            session.execute(
+                update(ProductClustersDB)
+                .where(ProductClustersDB.id == cluster.id)
+                .values(centroid=centroid, centroid_size=total)
+            )
+
+
+def compute_centroid(embeddings: np.ndarray) -> np.ndarray:
+    """Mean of the unit-normalised rows, as stored on canonical clusters."""
+    return normalize(embeddings).mean(axis=0).astype(np.float32)
@@ -0,0 +1,316 @@
+"""
+Persistent keyword corpora for warm-start TF-IDF.
+
+Document frequencies of description terms are kept per vertical category and
+region in ``keyword_terms`` and grow with every request, so keyword
+extraction can transform against a pre-fitted vocabulary instead of fitting
+TF-IDF on each request's few hundred descriptions.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, CountVectorizer
+from sklearn.preprocessing import normalize
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from config.constants import CLUSTERER_CONFIG, ClustererConfig
+from database import get_db, KeywordCorpusDB, KeywordTermDB
+
+# Longest term the keyword_terms table holds
+MAX_TERM_LENGTH = 255
+
+# Rows per upsert statement (4 bind parameters each)
+UPSERT_BATCH_SIZE = 5000
+
+
+def document_terms(tokens: Sequence[str]) -> List[str]:
+    """1- to 3-grams of a token list, without English stop words."""
+    words = [word for word in tokens if word not in ENGLISH_STOP_WORDS]
+    return [
+        " ".join(words[i : i + n]) for n in (1, 2, 3) for i in range(len(words) - n + 1)
+    ]
+
+
+def corpus_key(vertical: str, region: str) -> Tuple[str, str]:
+    """Normalized (vertical, region) key of a corpus."""
+    return vertical.strip().lower()[:50], region.strip().lower()[:10]
+
+
+@dataclass
+class KeywordCorpusUpdate:
+    """Stored counts of a corpus after an ``add_documents`` call."""
+
+    vertical: str
+    region: str
+    # Documents this update added
+    documents: int
+    # Corpus document count after the update
+    document_count: int
+    # New document frequency of every updated term within the lower bound
+    frequencies: Dict[str, int]
+
+
+class KeywordCorpus:
+    """
+    Vocabulary and document frequencies of one corpus.
+
+    ``frequencies`` holds every term within the lower document-frequency
+    bound; the vocabulary (``terms``) keeps those also within the upper
+    bound. ``transform`` gives the same weighting as a ``TfidfVectorizer``
+    fitted on the corpus (smoothed IDF, L2-normalized rows), restricted to
+    the vocabulary.
+    """
+
+    def __init__(
+        self,
+        vertical: str,
+        region: str,
+        document_count: int,
+        frequencies: Mapping[str, int],
+        max_df: float = 1.0,
+    ):
+        self.vertical = vertical
+        self.region = region
+        self.document_count = document_count
+        self.frequencies = dict(frequencies)
+        self.max_df = max_df
+
+        limit = max_df * document_count
+        self.terms = np.array(
+            sorted(term for term, df in self.frequencies.items() if df <= limit), dtype=object
+        )
+        self.document_frequencies = np.array(
+            [self.frequencies[term] for term in self.terms], dtype=np.int64
+        )
+        self.vocabulary = {term: index for index, term in enumerate(self.terms)}
+        self.idf = (
+            np.log((1 + document_count) / (1 + self.document_frequencies.astype(np.float64))) + 1
+        )
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def merged(self, update: KeywordCorpusUpdate) -> "KeywordCorpus":
+        """
+        A copy with a committed update applied.
+
+        Counts never shrink short of ``clear``, so the larger of the cached
+        and updated value wins; updates merged out of order still end at the
+        stored counts. Terms updated only by other processes catch up on the
+        next load.
+        """
+        frequencies = dict(self.frequencies)
+        for term, df in update.frequencies.items():
+            if df > frequencies.get(term, 0):
+                frequencies[term] = df
+        return KeywordCorpus(
+            self.vertical,
+            self.region,
+            max(self.document_count, update.document_count),
+            frequencies,
+            self.max_df,
+        )
+
+    def transform(self, tokens: Sequence[Sequence[str]]) -> Any:
+        """TF-IDF matrix (sparse, one row per token list) over the vocabulary."""
+        if not self.vocabulary:
+            raise ValueError("Keyword corpus has no terms")
+
+        counts = CountVectorizer(analyzer=document_terms, vocabulary=self.vocabulary).transform(
+            tokens
+        )
+        return normalize(counts.multiply(self.idf).tocsr())
+
+
+class KeywordCorpusStore:
+    """Reads and updates ``keyword_corpora`` / ``keyword_terms`` rows."""
+
+    def __init__(self, config: ClustererConfig = CLUSTERER_CONFIG):
+        self.config = config
+
+    def load(self, vertical: str, region: str) -> KeywordCorpus:
+        """
+        Load a corpus in one pass over its terms.
+
+        Only terms inside the configured lower document-frequency bound are
+        loaded; an unknown corpus loads empty.
+        """
+        vertical, region = corpus_key(vertical, region)
+
+        with get_db() as session:
+            document_count = (
+                session.scalar(
+                    select(KeywordCorpusDB.document_count).where(
+                        KeywordCorpusDB.vertical == vertical,
+                        KeywordCorpusDB.region == region,
+                    )
+                )
+                or 0
+            )
+            rows = session.execute(
+                select(KeywordTermDB.term, KeywordTermDB.document_frequency).where(
+                    KeywordTermDB.vertical == vertical,
+                    KeywordTermDB.region == region,
+                    KeywordTermDB.document_frequency >= self.config.KEYWORD_CORPUS_MIN_DF,
+                )
+            ).all()
+
+        return KeywordCorpus(
+            vertical,
+            region,
+            document_count,
+            {term: df for term, df in rows},
+            self.config.KEYWORD_CORPUS_MAX_DF,
+        )
+
+    def add_documents(
+        self, session: Session, vertical: str, region: str, tokens: Sequence[Sequence[str]]
+    ) -> Optional[KeywordCorpusUpdate]:
+        """
+        Add documents (token lists) to a corpus.
+
+        Counts each term once per document and adds the counts to the
+        stored ones; concurrent updates add up rather than overwrite. Runs in
+        the caller's transaction and does not commit: pass the result to
+        ``merge_keyword_corpus`` once it is committed.
+
+        Returns:
+            The stored counts after the update, or None without documents
+        """
+        vertical, region = corpus_key(vertical, region)
+        documents = [words for words in tokens if words]
+        if not documents:
+            return None
+
+        frequencies: Counter = Counter()
+        for words in documents:
+            frequencies.update(
+                term for term in set(document_terms(words)) if len(term) <= MAX_TERM_LENGTH
+            )
+
+        rows = [
+            {
+                "vertical": vertical,
+                "region": region,
+                "term": term,
+                "document_frequency": count,
+            }
+            # Same lock order for concurrent updates
+            for term, count in sorted(frequencies.items())
+        ]
+
+        corpus_stmt = insert(KeywordCorpusDB).values(
+            vertical=vertical,
+            region=region,
+            document_count=len(documents),
+            updated_at=datetime.now(timezone.utc),
+        )
+        corpus_stmt = corpus_stmt.on_conflict_do_update(
+            index_elements=[KeywordCorpusDB.vertical, KeywordCorpusDB.region],
+            set_={
+                "document_count": KeywordCorpusDB.document_count
+                + corpus_stmt.excluded.document_count,
+                "updated_at": corpus_stmt.excluded.updated_at,
+            },
+        ).returning(KeywordCorpusDB.document_count)
+
+        document_count = session.execute(corpus_stmt).scalar_one()
+        stored: Dict[str, int] = {}
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            stmt = insert(KeywordTermDB).values(rows[start : start + UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    KeywordTermDB.vertical,
+                    KeywordTermDB.region,
+                    KeywordTermDB.term,
+                ],
+                set_={
+                    "document_frequency": KeywordTermDB.document_frequency
+                    + stmt.excluded.document_frequency
+                },
+            ).returning(KeywordTermDB.term, KeywordTermDB.document_frequency)
+            stored.update(
+                (term, df)
+                for term, df in session.execute(stmt)
+                if df >= self.config.KEYWORD_CORPUS_MIN_DF
+            )
+
+        return KeywordCorpusUpdate(
+            vertical=vertical,
+            region=region,
+            documents=len(documents),
+            document_count=document_count,
+            frequencies=stored,
+        )
+
+    def clear(self, session: Session, vertical: str, region: str) -> None:
+        """Delete a corpus and its terms (in the caller's transaction)."""
+        vertical, region = corpus_key(vertical, region)
+        session.execute(
+            delete(KeywordTermDB).where(
+                KeywordTermDB.vertical == vertical, KeywordTermDB.region == region
+            )
+        )
+        session.execute(
+            delete(KeywordCorpusDB).where(
+                KeywordCorpusDB.vertical == vertical, KeywordCorpusDB.region == region
+            )
+        )
+        _forget_corpus(vertical, region)
+
+
+# Loaded corpora; committed updates are merged in, a clear drops them
+_corpora: Dict[Tuple[str, str], KeywordCorpus] = {}
+_corpora_lock = threading.Lock()
+
+
+def get_keyword_corpus(vertical: str, region: str) -> KeywordCorpus:
+    """Get a corpus, loading it on first use."""
+    key = corpus_key(vertical, region)
+    corpus = _corpora.get(key)
+    if corpus is None:
+        with _corpora_lock:
+            corpus = _corpora.get(key)
+            if corpus is None:
+                corpus = KeywordCorpusStore().load(*key)
+                _corpora[key] = corpus
+    return corpus
+
+
+def _forget_corpus(vertical: str, region: str) -> None:
+    """Drop a cached corpus so the next use reloads it."""
+    with _corpora_lock:
+        _corpora.pop(corpus_key(vertical, region), None)
+
+
+def update_keyword_corpus(
+    session: Session, vertical: str, region: str, tokens: Sequence[Sequence[str]]
+) -> Optional[KeywordCorpusUpdate]:
+    """Add documents to a corpus through the default store (see ``add_documents``)."""
+    return KeywordCorpusStore().add_documents(session, vertical, region, tokens)
+
+
+def merge_keyword_corpus(update: KeywordCorpusUpdate) -> None:
+    """Apply a committed update to the cached corpus, if it is loaded."""
+    key = (update.vertical, update.region)
+    with _corpora_lock:
+        corpus = _corpora.get(key)
+        if corpus is not None:
+            _corpora[key] = corpus.merged(update)
+
+
+def warm_keyword_corpus(
+    vertical: str, region: str, config: ClustererConfig = CLUSTERER_CONFIG
+) -> Optional[KeywordCorpus]:
+    """The corpus for a vertical/region if it holds enough documents, else None."""
+    corpus = get_keyword_corpus(vertical, region)
+    if corpus.document_count < config.KEYWORD_CORPUS_MIN_DOCUMENTS or not len(corpus):
+        return None
+    return corpus
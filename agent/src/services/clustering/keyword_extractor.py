@@ -5,13 +5,15 @@ Extracts meaningful labels/keywords from clustered product descriptions
 using TF-IDF, n-gram frequency, and phrase scoring.
 """
 
-import re
 from collections import Counter, defaultdict
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any
 
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 
+from .keyword_corpus import KeywordCorpus, document_terms
+from .text_normalizer import TextNormalizer, DIGITS, ASCII_UPPERCASE
+
 
 class ClusterKeywordExtractor:
     """
@@ -74,46 +76,46 @@ class ClusterKeywordExtractor:
             r"\bcolor[:\s]+\w+\b",
         ]
 
+        # Literals one of which each spec pattern needs, to skip it cheaply
+        self.spec_guards = [DIGITS, ("pack",), ("x",), ("size",), ("color",)]
+
         # Brand name indicator pattern
         self.brand_pattern = r"\b[A-Z][A-Z0-9]{2,15}\b"
 
+        # Compiled normalizer for the patterns above
+        self.normalizer = TextNormalizer(
+            self.noise_words,
+            self.spec_patterns,
+            self.brand_pattern,
+            spec_guards=self.spec_guards,
+            brand_guard=ASCII_UPPERCASE,
+        )
+
     def preprocess_text(self, text: str, remove_brands: bool = True) -> str:
         """Clean and normalize product description text."""
-        if not isinstance(text, str):
-            return ""
-
-        text = text.lower()
-
-        # Remove URLs
-        text = re.sub(r"http\S+|www\.\S+", "", text)
-
-        # Remove specifications
-        for pattern in self.spec_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove brand names
-        if remove_brands:
-            text = re.sub(self.brand_pattern, "", text)
-
-        # Remove special characters
-        text = re.sub(r"[^\w\s-]", " ", text)
+        return self.normalizer.normalize(text, remove_brands)
 
-        # Remove standalone numbers
-        text = re.sub(r"\b\d+\b", "", text)
+    def preprocess_texts(self, texts: List[str], remove_brands: bool = True) -> List[str]:
+        """Clean and normalize many descriptions in one pass."""
+        return self.normalizer.normalize_batch(texts, remove_brands)
 
-        # Remove noise words and short words
-        words = [w for w in text.split() if w not in self.noise_words and len(w) > 2]
-
-        return " ".join(words).strip()
+    def tokenize(self, texts: List[str]) -> List[List[str]]:
+        """Normalized descriptions split into tokens (as stored in keyword corpora)."""
+        return [text.split() for text in self.preprocess_texts(texts)]
 
     def extract_ngrams(
         self, texts: List[str], n: int = 2, min_freq: int = 2
     ) -> List[Tuple[str, int]]:
         """Extract frequent n-grams from texts."""
+        return self.count_ngrams([text.split() for text in texts], n=n, min_freq=min_freq)
+
+    def count_ngrams(
+        self, tokens: List[List[str]], n: int = 2, min_freq: int = 2
+    ) -> List[Tuple[str, int]]:
+        """Extract frequent n-grams from already tokenized texts."""
         ngram_counter: Counter = Counter()
 
-        for text in texts:
-            words = text.split()
+        for words in tokens:
             if len(words) < n:
                 continue
 
@@ -160,25 +162,32 @@ class ClusterKeywordExtractor:
     def score_phrases(
         self, phrases: List[str], cluster_texts: List[str]
     ) -> Dict[str, float]:
-        """Score phrases based on coverage, specificity, and position."""
+        """
+        Score phrases based on coverage, specificity, and position.
+
+        Matching is done on one joined copy of the texts, so finding where a
+        phrase first occurs in every text is a single scan per phrase.
+        """
         scores = {}
         num_texts = len(cluster_texts)
+        corpus = _TextCorpus(cluster_texts)
 
         for phrase in phrases:
+            if phrase in scores:
+                continue
+
+            hits, offsets = corpus.first_occurrences(phrase)
+
             # Coverage score
-            coverage = sum(1 for text in cluster_texts if phrase in text) / num_texts
+            coverage = len(hits) / num_texts
 
             # Length score (prefer 2-3 word phrases)
             words = phrase.split()
             length_score = min(len(words) / 3, 1.0)
 
             # Position score (prefer early appearance)
-            positions = []
-            for text in cluster_texts:
-                if phrase in text:
-                    pos = text.index(phrase)
-                    positions.append(pos / max(len(text), 1))
-            position_score = 1 - (np.mean(positions) if positions else 1)
+            positions = offsets / corpus.denominators[hits]
+            position_score = 1 - (np.mean(positions) if len(positions) else 1)
 
             # Combined score
             scores[phrase] = coverage * 0.5 + length_score * 0.3 + position_score * 0.2
@@ -204,7 +213,7 @@ class ClusterKeywordExtractor:
             }
 
         # Preprocess
-        processed_texts = [self.preprocess_text(t) for t in cluster_texts]
+        processed_texts = self.preprocess_texts(cluster_texts)
         processed_texts = [t for t in processed_texts if t]
 
         if not processed_texts:
@@ -214,22 +223,33 @@ class ClusterKeywordExtractor:
                 "method": "empty_after_processing",
             }
 
+        tfidf_keywords = self.get_tfidf_keywords(processed_texts, top_n=20)
+        tokens = [text.split() for text in processed_texts]
+        return self._rank_candidates(
+            processed_texts, tokens, tfidf_keywords, top_n, len(cluster_texts)
+        )
+
+    def _rank_candidates(
+        self,
+        processed_texts: List[str],
+        tokens: List[List[str]],
+        tfidf_keywords: List[Tuple[str, float]],
+        top_n: int,
+        cluster_size: int,
+    ) -> Dict[str, Any]:
+        """Add n-gram and frequent-word candidates to the TF-IDF ones and score them."""
         candidates = []
 
         # TF-IDF keywords
-        tfidf_keywords = self.get_tfidf_keywords(processed_texts, top_n=20)
         candidates.extend([kw for kw, _ in tfidf_keywords])
 
         # N-grams
         for n in [2, 3]:
-            ngrams = self.extract_ngrams(
-                processed_texts, n=n, min_freq=max(2, len(processed_texts) // 3)
-            )
+            ngrams = self.count_ngrams(tokens, n=n, min_freq=max(2, len(processed_texts) // 3))
             candidates.extend([ng for ng, _ in ngrams[:10]])
 
         # Common single words
-        all_words = " ".join(processed_texts).split()
-        word_freq = Counter(all_words).most_common(15)
+        word_freq = Counter(word for words in tokens for word in words).most_common(15)
         candidates.extend([word for word, _ in word_freq if len(word) > 3])
 
         # Score and sort
@@ -238,7 +258,7 @@ class ClusterKeywordExtractor:
 
         return {
             "keywords": sorted_phrases[:top_n],
-            "cluster_size": len(cluster_texts),
+            "cluster_size": cluster_size,
             "method": "combined",
         }
 
@@ -247,25 +267,41 @@ class ClusterKeywordExtractor:
         texts: List[str],
         cluster_labels: np.ndarray,
         top_n: int = 10,
+        idf_scope: str = "cluster",
+        corpus: Optional[KeywordCorpus] = None,
     ) -> Dict[int, Dict]:
         """
         Get keywords for all clusters from DBSCAN results.
 
         Args:
             texts: All product descriptions
-            cluster_labels: Cluster assignments from DBSCAN (-1 = noise)
+            cluster_labels: Cluster assignments from DBSCAN (-1 = noise; not
+                labelled, but part of the shared TF-IDF fit)
             top_n: Number of keywords per cluster
+            idf_scope: "cluster" fits TF-IDF on each cluster's texts;
+                "request" preprocesses, tokenizes and fits TF-IDF once over
+                all texts and ranks each cluster's terms from its rows;
+                "corpus" does the same but only transforms against ``corpus``
+            corpus: Pre-fitted keyword corpus, required for "corpus"
 
         Returns:
             Dict mapping cluster_id -> cluster info with keywords
         """
-        clusters: Dict[int, List[str]] = defaultdict(list)
+        if idf_scope not in ("cluster", "request", "corpus"):
+            raise ValueError(f"Unknown IDF scope: {idf_scope}")
+        if idf_scope == "corpus" and corpus is None:
+            raise ValueError("IDF scope 'corpus' needs a keyword corpus")
+
+        clusters: Dict[int, List[int]] = defaultdict(list)
+
+        for index, label in enumerate(cluster_labels):
+            clusters[int(label)].append(index)
 
-        for text, label in zip(texts, cluster_labels):
-            clusters[int(label)].append(text)
+        shared = None if idf_scope == "cluster" else self._shared_tfidf(texts, corpus)
 
         results = {}
-        for cluster_id, cluster_texts in clusters.items():
+        for cluster_id, indexes in clusters.items():
+            cluster_texts = [texts[i] for i in indexes]
             if cluster_id == -1:
                 results[cluster_id] = {
                     "keywords": [],
@@ -274,8 +310,163 @@ class ClusterKeywordExtractor:
                     "sample_texts": cluster_texts[:3],
                 }
             else:
-                keyword_info = self.extract_cluster_keywords(cluster_texts, top_n=top_n)
+                if shared is None:
+                    keyword_info = self.extract_cluster_keywords(cluster_texts, top_n=top_n)
+                else:
+                    keyword_info = shared.cluster_keywords(self, indexes, top_n=top_n)
                 keyword_info["sample_texts"] = cluster_texts[:3]
                 results[cluster_id] = keyword_info
 
         return results
+
+    def _shared_tfidf(
+        self, texts: List[str], corpus: Optional[KeywordCorpus] = None
+    ) -> "_SharedTfidf":
+        """Preprocess, tokenize and vectorize all texts once."""
+        processed_texts = self.preprocess_texts(texts)
+        tokens = [text.split() for text in processed_texts]
+        return _SharedTfidf(processed_texts, tokens, corpus)
+
+
+class _TextCorpus:
+    """
+    Texts joined into one string for fast substring lookups.
+
+    ``first_occurrences`` finds the first match of a phrase in every text
+    with one ``str.split`` over the joined string, giving the same results
+    as ``text.index(phrase)`` per text.
+    """
+
+    SEPARATOR = "\n"
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.joined = self.SEPARATOR.join(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        self.starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1])).astype(np.int64)
+        self.denominators = np.maximum(lengths, 1).astype(np.float64)
+        # Texts holding the separator would let phrases match across texts
+        self.splittable = self.joined.count(self.SEPARATOR) == max(len(texts) - 1, 0)
+
+    def first_occurrences(self, phrase: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Texts containing ``phrase`` and where it first starts in each.
+
+        Returns:
+            Tuple of (text indexes, character offsets), in text order
+        """
+        if not phrase or self.SEPARATOR in phrase or not self.splittable:
+            found = [(i, text.find(phrase)) for i, text in enumerate(self.texts)]
+            found = [(i, offset) for i, offset in found if offset >= 0]
+            return (
+                np.array([i for i, _ in found], dtype=np.int64),
+                np.array([offset for _, offset in found], dtype=np.int64),
+            )
+
+        # Non-overlapping leftmost matches; gaps between them give positions
+        parts = self.joined.split(phrase)
+        gaps = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts))[:-1]
+        matches = np.cumsum(gaps) + np.arange(len(gaps), dtype=np.int64) * len(phrase)
+
+        texts = np.searchsorted(self.starts, matches, side="right") - 1
+        first = np.ones(len(texts), dtype=bool)
+        first[1:] = texts[1:] != texts[:-1]
+        texts = texts[first]
+        return texts, matches[first] - self.starts[texts]
+
+
+class _SharedTfidf:
+    """
+    One TF-IDF matrix over every text of a request.
+
+    Texts are tokenized once (the normalizer already lowercased them and
+    stripped punctuation, so whitespace splitting is enough); the same tokens
+    feed the vectorizer and the n-gram counts. A cluster's top terms are the
+    column sums over its rows of the shared matrix, so IDF reflects how
+    common a term is across the whole request rather than within the cluster.
+    With a keyword corpus the matrix is only a transform against the
+    corpus vocabulary and IDF; otherwise TF-IDF is fitted on the texts.
+    """
+
+    def __init__(
+        self,
+        processed_texts: List[str],
+        tokens: List[List[str]],
+        corpus: Optional[KeywordCorpus] = None,
+    ):
+        self.processed_texts = processed_texts
+        self.tokens = tokens
+
+        # Empty texts are kept out of the matrix; rows maps text index -> matrix row
+        documents = [i for i, text in enumerate(processed_texts) if text]
+        self.rows = {index: row for row, index in enumerate(documents)}
+
+        self.matrix: Any = None
+        self.feature_names: Any = None
+        try:
+            if corpus is not None:
+                self.matrix = corpus.transform([tokens[i] for i in documents])
+                self.feature_names = corpus.terms
+            else:
+                vectorizer = TfidfVectorizer(
+                    analyzer=document_terms,
+                    min_df=int(min(2, max(1, len(documents) * 0.1))),
+                    max_df=0.8,
+                )
+                self.matrix = vectorizer.fit_transform([tokens[i] for i in documents])
+                self.feature_names = vectorizer.get_feature_names_out()
+        except ValueError:
+            # Too few texts or no term within the document-frequency bounds
+            self.matrix = None
+            self.feature_names = None
+
+    def cluster_keywords(
+        self,
+        extractor: ClusterKeywordExtractor,
+        indexes: List[int],
+        top_n: int = 10,
+        min_cluster_size: int = 2,
+    ) -> Dict[str, Any]:
+        """Same result as ``extract_cluster_keywords`` for the texts at ``indexes``."""
+        cluster_size = len(indexes)
+        if cluster_size < min_cluster_size:
+            return {
+                "keywords": [],
+                "cluster_size": cluster_size,
+                "method": "size_filter",
+            }
+
+        indexes = [i for i in indexes if self.processed_texts[i]]
+        if not indexes:
+            return {
+                "keywords": [],
+                "cluster_size": cluster_size,
+                "method": "empty_after_processing",
+            }
+
+        processed_texts = [self.processed_texts[i] for i in indexes]
+        tokens = [self.tokens[i] for i in indexes]
+        return extractor._rank_candidates(
+            processed_texts,
+            tokens,
+            self.top_terms(indexes, tokens, top_n=20),
+            top_n,
+            cluster_size,
+        )
+
+    def top_terms(
+        self, indexes: List[int], tokens: List[List[str]], top_n: int
+    ) -> List[Tuple[str, float]]:
+        """Highest summed TF-IDF terms over the given texts' rows."""
+        if self.matrix is None:
+            # Fall back to word frequency
+            word_freq = Counter(word for words in tokens for word in words)
+            return [(str(w), float(c)) for w, c in word_freq.most_common(top_n)]
+
+        rows = [self.rows[i] for i in indexes]
+        scores = np.asarray(self.matrix[rows].sum(axis=0)).flatten()
+
+        # Terms absent from these rows score 0 and are left out
+        present = np.flatnonzero(scores)
+        top_indices = present[scores[present].argsort()[-top_n:][::-1]]
+        return [(str(self.feature_names[i]), float(scores[i])) for i in top_indices]
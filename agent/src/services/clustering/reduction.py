@@ -0,0 +1,186 @@
+"""
+Embedding dimensionality reduction.
+
+Projects embeddings to a lower dimension before clustering so DBSCAN's
+pairwise distance work shrinks with the vector size.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+import joblib
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.metrics import adjusted_rand_score
+from sklearn.preprocessing import normalize
+from sklearn.random_projection import GaussianRandomProjection
+
+from config.constants import CLUSTERER_CONFIG, ClustererConfig
+from .engines import get_clustering_engine
+
+REDUCTION_METHODS = ("none", "svd", "random_projection")
+
+
+class EmbeddingReducer:
+    """
+    Fitted projection from embedding space to ``n_components`` dimensions.
+
+    Output rows are L2-normalised so cosine distances stay comparable
+    with the configured DBSCAN eps. SVD is used without centring (unlike
+    PCA) because centring changes the angles between vectors.
+    """
+
+    def __init__(self, method: str, n_components: int, random_state: int = 42):
+        if method not in REDUCTION_METHODS or method == "none":
+            raise ValueError(f"Unknown reduction method: {method!r}")
+
+        self.method = method
+        self.n_components = n_components
+        self.random_state = random_state
+        self.model: Any = (
+            TruncatedSVD(n_components=n_components, random_state=random_state)
+            if method == "svd"
+            else GaussianRandomProjection(n_components=n_components, random_state=random_state)
+        )
+        self.n_features: int | None = None
+
+    def fit(self, embeddings: np.ndarray) -> "EmbeddingReducer":
+        """Fit the projection on an embedding matrix."""
+        self.model.fit(embeddings)
+        self.n_features = embeddings.shape[1]
+        return self
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """Project and re-normalise embeddings."""
+        reduced = self.model.transform(embeddings)
+        return normalize(reduced).astype(np.float32, copy=False)
+
+    def fit_transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """Fit on and project the same matrix."""
+        return self.fit(embeddings).transform(embeddings)
+
+    def save(self, path: str) -> None:
+        """Persist the fitted projection."""
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingReducer":
+        """Load a projection saved with ``save``."""
+        return joblib.load(path)
+
+
+# Fitted random projections, keyed by (n_features, n_components, random_state).
+# They don't depend on the data, so one instance serves every request.
+_projection_cache: Dict[Tuple[int, int, int], EmbeddingReducer] = {}
+_projection_cache_lock = threading.Lock()
+
+
+def get_reducer(
+    embeddings: np.ndarray,
+    config: ClustererConfig = CLUSTERER_CONFIG,
+) -> EmbeddingReducer | None:
+    """
+    Get a fitted reducer for the configured method, or None if disabled.
+
+    A projection stored at ``REDUCTION_MODEL_PATH`` is reused when its input
+    size matches; otherwise a new one is fitted and saved there. Random
+    projections are additionally cached in-process.
+    """
+    if config.REDUCTION_METHOD == "none":
+        return None
+
+    n_features = embeddings.shape[1]
+    path = config.REDUCTION_MODEL_PATH
+
+    if path and os.path.exists(path):
+        reducer = EmbeddingReducer.load(path)
+        if (
+            reducer.method == config.REDUCTION_METHOD
+            and reducer.n_components == config.REDUCTION_DIMENSIONS
+            and reducer.n_features == n_features
+        ):
+            return reducer
+
+    key = (n_features, config.REDUCTION_DIMENSIONS, config.REDUCTION_RANDOM_STATE)
+    if config.REDUCTION_METHOD == "random_projection":
+        with _projection_cache_lock:
+            if key in _projection_cache:
+                return _projection_cache[key]
+
+    reducer = EmbeddingReducer(
+        config.REDUCTION_METHOD,
+        config.REDUCTION_DIMENSIONS,
+        config.REDUCTION_RANDOM_STATE,
+    ).fit(embeddings)
+
+    if config.REDUCTION_METHOD == "random_projection":
+        with _projection_cache_lock:
+            _projection_cache[key] = reducer
+
+    if path:
+        reducer.save(path)
+
+    return reducer
+
+
+def reduce_embeddings(
+    embeddings: np.ndarray,
+    config: ClustererConfig = CLUSTERER_CONFIG,
+) -> np.ndarray:
+    """
+    Apply the configured reduction, or return the input unchanged.
+
+    Reduction is skipped for small requests (below ``REDUCTION_MIN_SAMPLES``)
+    and when the target size is not smaller than the input.
+    """
+    if (
+        config.REDUCTION_METHOD == "none"
+        or embeddings.shape[0] < config.REDUCTION_MIN_SAMPLES
+        or config.REDUCTION_DIMENSIONS >= embeddings.shape[1]
+    ):
+        return embeddings
+
+    reducer = get_reducer(embeddings, config)
+    return reducer.transform(embeddings) if reducer else embeddings
+
+
+def evaluate_reduction(
+    embeddings: np.ndarray,
+    config: ClustererConfig = CLUSTERER_CONFIG,
+) -> Dict[str, float]:
+    """
+    Compare clustering with and without the configured reduction.
+
+    Both runs use the configured clustering engine. Returns the adjusted
+    Rand index between the two labelings plus wall-clock timings, so a
+    reduction setting can be checked on real request data before enabling it.
+    """
+    engine = get_clustering_engine(config)
+
+    start = time.perf_counter()
+    baseline = engine.fit_predict(embeddings)
+    baseline_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reducer = EmbeddingReducer(
+        config.REDUCTION_METHOD,
+        config.REDUCTION_DIMENSIONS,
+        config.REDUCTION_RANDOM_STATE,
+    )
+    reduced = reducer.fit_transform(embeddings)
+    reduction_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    labels = engine.fit_predict(reduced)
+    reduced_seconds = time.perf_counter() - start
+
+    return {
+        "adjusted_rand_index": float(adjusted_rand_score(baseline, labels)),
+        "baseline_clusters": float(len(set(baseline)) - (1 if -1 in baseline else 0)),
+        "reduced_clusters": float(len(set(labels)) - (1 if -1 in labels else 0)),
+        "baseline_seconds": baseline_seconds,
+        "reduction_seconds": reduction_seconds,
+        "reduced_clustering_seconds": reduced_seconds,
+    }
@@ -0,0 +1,100 @@
+"""
+Product description normalizer.
+
+Precompiled version of the cleanup done by
+``ClusterKeywordExtractor.preprocess_text``. Each pass can carry a guard (a
+few literals, one of which any match must contain) so passes that cannot
+match a description are skipped with a cheap substring check.
+"""
+
+import re
+from typing import Any, Iterable, List, Optional, Sequence
+
+# Literal sets for guards
+DIGITS = tuple("0123456789")
+ASCII_UPPERCASE = tuple("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# A guard is None (always run) or literals one of which must be in the text
+Guard = Optional[Sequence[str]]
+
+_URL_PATTERN = re.compile(r"http\S+|www\.\S+")
+_URL_GUARD = ("http", "www.")
+_SPECIAL_PATTERN = re.compile(r"[^\w\s-]")
+_NUMBER_PATTERN = re.compile(r"\b\d+\b")
+
+# Characters that can match a guard literal without containing it, in
+# lowercased text: under re.IGNORECASE "ı" matches "i" and "ſ" matches "s",
+# and \d matches non-ASCII digits
+_GUARD_BREAKERS = re.compile(r"[ıſ]|(?![0-9])\d")
+
+
+class TextNormalizer:
+    """
+    Lowercases descriptions and strips URLs, specs, brands, punctuation,
+    standalone numbers, noise words and words of two letters or fewer.
+
+    Output is identical to running the same patterns with ``re.sub`` one
+    after another. Guards are ignored for text with characters that match a
+    literal without containing it (see ``_GUARD_BREAKERS``).
+    """
+
+    def __init__(
+        self,
+        noise_words: Iterable[str],
+        spec_patterns: Sequence[str],
+        brand_pattern: str,
+        spec_guards: Optional[Sequence[Guard]] = None,
+        brand_guard: Guard = None,
+    ):
+        self.noise_words = frozenset(noise_words)
+        spec_guards = spec_guards or [None] * len(spec_patterns)
+        # Applied one after another: removing one spec can expose another
+        self.spec_passes = [
+            (re.compile(pattern, flags=re.IGNORECASE), guard)
+            for pattern, guard in zip(spec_patterns, spec_guards)
+        ]
+        self.brand_pattern = re.compile(brand_pattern)
+        self.brand_guard = brand_guard
+
+    def normalize(self, text: Any, remove_brands: bool = True) -> str:
+        """Clean and normalize one description."""
+        if not isinstance(text, str):
+            return ""
+
+        text = text.lower()
+        guarded = text.isascii() or not _GUARD_BREAKERS.search(text)
+
+        def may_match(guard: Guard) -> bool:
+            return not guarded or guard is None or any(literal in text for literal in guard)
+
+        if may_match(_URL_GUARD):
+            text = _URL_PATTERN.sub("", text)
+
+        for pattern, guard in self.spec_passes:
+            if may_match(guard):
+                text = pattern.sub("", text)
+
+        if remove_brands and may_match(self.brand_guard):
+            text = self.brand_pattern.sub("", text)
+
+        text = _SPECIAL_PATTERN.sub(" ", text)
+
+        if may_match(DIGITS):
+            text = _NUMBER_PATTERN.sub("", text)
+
+        noise_words = self.noise_words
+        return " ".join(w for w in text.split() if w not in noise_words and len(w) > 2)
+
+    def normalize_batch(self, texts: Iterable[Any], remove_brands: bool = True) -> List[str]:
+        """
+        Clean and normalize many descriptions.
+
+        Args:
+            texts: Descriptions; non-strings normalize to ""
+            remove_brands: Strip brand-like tokens
+
+        Returns:
+            One normalized string per input, in order
+        """
+        normalize = self.normalize
+        return [normalize(text, remove_brands) for text in texts]
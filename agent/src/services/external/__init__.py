@@ -1,10 +1,27 @@
 """External API services."""
 
-from .apify import ApifyService
-from .dataforseo import DataForSEOService, get_trends
+from .apify import ApifyService, get_apify_service, close_apify_service
+from .dataforseo import (
+    DataForSEOService,
+    get_dataforseo_service,
+    close_dataforseo_service,
+    get_trends,
+    get_trends_batch,
+    region_location_code,
+)
+from .trend_store import TrendPointStore, TrendRefresher, get_search_series
 
 __all__ = [
     "ApifyService",
+    "get_apify_service",
+    "close_apify_service",
     "DataForSEOService",
+    "get_dataforseo_service",
+    "close_dataforseo_service",
     "get_trends",
+    "get_trends_batch",
+    "region_location_code",
+    "TrendPointStore",
+    "TrendRefresher",
+    "get_search_series",
 ]
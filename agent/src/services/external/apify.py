@@ -2,119 +2,369 @@
 Apify service for web scraping via Apify actors.
 """
 
-from typing import List
+import atexit
+import hashlib
+import json
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from apify_client import ApifyClient
+from sqlalchemy.dialects.postgresql import insert
 
 from config import get_settings
+from config.constants import SCRAPER_CONFIG, ScraperConfig
 from schemas import ProductMetrics, SearchCriteria, Platforms, Currencies
+from database import get_db, ScrapeCacheDB
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScrapeCacheEntry:
+    """A cached scrape result and whether it is past its TTL."""
+
+    products: List[dict]
+    fetched_at: datetime
+    stale: bool = False
+
+
+class ScrapeResultCache:
+    """
+    Postgres-backed cache of normalized products per actor input.
+
+    Entries younger than ``CACHE_TTL_SECONDS`` are fresh. Entries within the
+    following ``CACHE_STALE_WHILE_REVALIDATE_SECONDS`` are returned as stale,
+    and the caller is expected to refresh them in the background.
+    """
+
+    def __init__(self, config: ScraperConfig = SCRAPER_CONFIG):
+        self.config = config
+
+    @staticmethod
+    def make_key(actor_id: str, run_input: dict) -> str:
+        """Stable hash of an actor id and its run input."""
+        payload = json.dumps({"actor": actor_id, "input": run_input}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, actor_id: str, run_input: dict) -> Optional[ScrapeCacheEntry]:
+        """Return the cached entry, or None if missing or expired."""
+        with get_db() as session:
+            row = session.get(ScrapeCacheDB, self.make_key(actor_id, run_input))
+            if row is None:
+                return None
+            products, fetched_at = row.products, row.fetched_at
+
+        age = datetime.now(timezone.utc) - fetched_at
+        ttl = timedelta(seconds=self.config.CACHE_TTL_SECONDS)
+        if age <= ttl:
+            return ScrapeCacheEntry(products=products, fetched_at=fetched_at)
+
+        stale_window = timedelta(seconds=self.config.CACHE_STALE_WHILE_REVALIDATE_SECONDS)
+        if age <= ttl + stale_window:
+            return ScrapeCacheEntry(products=products, fetched_at=fetched_at, stale=True)
+
+        return None
+
+    def put(self, actor_id: str, run_input: dict, products: List[dict]) -> None:
+        """Insert or replace the cached products for an actor input."""
+        values = {
+            "cache_key": self.make_key(actor_id, run_input),
+            "actor_id": actor_id,
+            "run_input": run_input,
+            "products": products,
+            "fetched_at": datetime.now(timezone.utc),
+        }
+        stmt = insert(ScrapeCacheDB).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScrapeCacheDB.cache_key],
+            set_={
+                "products": stmt.excluded.products,
+                "fetched_at": stmt.excluded.fetched_at,
+            },
+        )
+
+        with get_db() as session:
+            session.execute(stmt)
+            session.commit()
+
+
+# Background actor runs that refresh stale cache entries
+_revalidation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="apify-revalidate")
+_revalidating: set[str] = set()
+_revalidating_lock = threading.Lock()
 
 
 class ApifyService:
-    """Service for interacting with Apify actors."""
+    """
+    Service for interacting with Apify actors.
 
-    def __init__(self, token: str | None = None):
+    The ``ApifyClient`` keeps its HTTP connections alive between calls and is
+    safe to share across threads. Use ``get_apify_service`` for the
+    process-wide instance.
+    """
+
+    def __init__(self, token: str | None = None, config: ScraperConfig = SCRAPER_CONFIG):
         settings = get_settings()
         self.client = ApifyClient(token or settings.apify_token)
+        self.config = config
+        self.cache = ScrapeResultCache(config) if config.CACHE_ENABLED else None
         self._is_dev = settings.env == "development"
 
-    def run_amazon_scraper(self, criteria: SearchCriteria) -> List[ProductMetrics]:
+    def close(self) -> None:
+        """Close the client's pooled HTTP connections."""
+        http_client = getattr(self.client, "http_client", None)
+        # apify-client 1.x wraps an httpx client; newer versions close directly
+        close = getattr(http_client, "close", None) or getattr(
+            getattr(http_client, "httpx_client", None), "close", None
+        )
+        if close:
+            close()
+
+    def run_amazon_scraper(
+        self,
+        criteria: SearchCriteria,
+        concurrent: bool = True,
+    ) -> List[ProductMetrics]:
         """
         Run Amazon product scraper for given search criteria.
 
         Args:
             criteria: Search criteria with keywords and region
+            concurrent: Set False to run keywords one after another
 
         Returns:
-            List of normalized ProductMetrics
+            List of normalized ProductMetrics, grouped in keyword order
         """
-        products: List[ProductMetrics] = []
-
-        for keyword in criteria.primary_keywords:
-            run_input = {
-                "input": [
-                    {
-                        "keyword": keyword,
-                        "domainCode": (
-                            "com" if criteria.target_region == "us" else criteria.target_region
-                        ),
-                        "sortBy": "relevanceblender",
-                        "maxPages": 1,
-                    }
-                ]
-            }
+        results: Dict[str, List[ProductMetrics]] = defaultdict(list)
+        for keyword, batch in self.stream_amazon_scraper(criteria, concurrent=concurrent):
+            results[keyword].extend(batch)
+
+        return [
+            product for keyword in self._keywords_for(criteria) for product in results[keyword]
+        ]
+
+    def stream_amazon_scraper(
+        self,
+        criteria: SearchCriteria,
+        concurrent: bool = True,
+    ) -> Iterator[Tuple[str, List[ProductMetrics]]]:
+        """
+        Stream normalized products as keyword runs finish.
+
+        Keyword runs are launched together on a bounded worker pool
+        (``ScraperConfig.MAX_CONCURRENT_RUNS``). Each finished run's dataset
+        is read lazily and yielded in batches of ``STREAM_BATCH_SIZE``, so
+        the consumer can work on one keyword while the others still scrape.
+        Keywords with a cached result for the same actor input skip the run.
+
+        Args:
+            criteria: Search criteria with keywords and region
+            concurrent: Set False to run keywords one after another
 
-            run = self.client.actor("9GmEDf8sr9Jyb6b3X").call(run_input=run_input)
+        Yields:
+            (keyword, batch of ProductMetrics) tuples in completion order
+        """
+        region = criteria.target_region
+        keywords = self._keywords_for(criteria)
 
-            if run is not None:
-                iterator = self.client.dataset(run["defaultDatasetId"]).iterate_items()
-                products.extend(
-                    self._normalize_products(
-                        list(iterator),
-                        criteria.target_region,
-                        keyword,
-                    )
+        for keyword, cached, run in self._iter_sources(keywords, region, concurrent):
+            if cached is not None:
+                products: Iterable[ProductMetrics] = (
+                    ProductMetrics.model_validate(p) for p in cached
                 )
+            elif run is not None:
+                products = self._read_run(run, region, keyword)
+            else:
+                continue
+
+            batch: List[ProductMetrics] = []
+            for product in products:
+                batch.append(product)
+                if len(batch) >= self.config.STREAM_BATCH_SIZE:
+                    yield keyword, batch
+                    batch = []
 
-            # In development, only process first keyword
-            if self._is_dev:
-                break
+            if batch:
+                yield keyword, batch
 
-        return products
+    def _keywords_for(self, criteria: SearchCriteria) -> List[str]:
+        """Keywords to scrape for the given criteria."""
+        keywords = list(criteria.primary_keywords)
+
+        # In development, only process first keyword
+        if self._is_dev:
+            keywords = keywords[:1]
+
+        return keywords
+
+    def _iter_sources(
+        self,
+        keywords: List[str],
+        region: str,
+        concurrent: bool,
+    ) -> Iterator[Tuple[str, Optional[List[dict]], Any]]:
+        """Yield (keyword, cached products, actor run) as each keyword resolves."""
+        max_workers = min(self.config.MAX_CONCURRENT_RUNS, len(keywords))
+
+        if not concurrent or max_workers <= 1:
+            for keyword in keywords:
+                yield keyword, *self._resolve_keyword(keyword, region)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self._resolve_keyword, keyword, region): keyword
+                for keyword in keywords
+            }
+            for future in as_completed(futures):
+                yield futures[future], *future.result()
+
+    def _resolve_keyword(self, keyword: str, region: str) -> Tuple[Optional[List[dict]], Any]:
+        """Return cached products for a keyword, or run the actor and return the run."""
+        run_input = self._build_run_input(keyword, region)
+
+        if self.cache is not None:
+            entry = self.cache.get(self.config.AMAZON_ACTOR_ID, run_input)
+            if entry is not None:
+                if entry.stale:
+                    self._schedule_revalidation(keyword, region, run_input)
+                return entry.products, None
+
+        return None, self.client.actor(self.config.AMAZON_ACTOR_ID).call(run_input=run_input)
+
+    def _read_run(self, run: Any, region: str, keyword: str) -> Iterator[ProductMetrics]:
+        """Lazily normalize a finished run's dataset, caching it once fully read."""
+        items = self.client.dataset(run["defaultDatasetId"]).iterate_items()
+
+        dumped: List[dict] = []
+        for product in self._normalize_products(items, region, keyword):
+            if self.cache is not None:
+                dumped.append(product.model_dump(mode="json"))
+            yield product
+
+        if self.cache is not None and dumped:
+            self.cache.put(
+                self.config.AMAZON_ACTOR_ID, self._build_run_input(keyword, region), dumped
+            )
+
+    def _schedule_revalidation(self, keyword: str, region: str, run_input: dict) -> None:
+        """Refresh a stale cache entry in the background, once per key."""
+        key = ScrapeResultCache.make_key(self.config.AMAZON_ACTOR_ID, run_input)
+        with _revalidating_lock:
+            if key in _revalidating:
+                return
+            _revalidating.add(key)
+
+        def revalidate() -> None:
+            try:
+                run = self.client.actor(self.config.AMAZON_ACTOR_ID).call(run_input=run_input)
+                if run is not None:
+                    # Drain the dataset so _read_run stores the fresh result
+                    for _ in self._read_run(run, region, keyword):
+                        pass
+            except Exception:
+                # Background thread: nothing upstream to raise to
+                logger.exception("Scrape cache revalidation failed for %r", keyword)
+            finally:
+                with _revalidating_lock:
+                    _revalidating.discard(key)
+
+        _revalidation_pool.submit(revalidate)
+
+    def _build_run_input(self, keyword: str, region: str) -> dict:
+        """Actor input for one keyword; also used as the cache key."""
+        return {
+            "input": [
+                {
+                    "keyword": keyword,
+                    "domainCode": "com" if region == "us" else region,
+                    "sortBy": self.config.AMAZON_SORT_BY,
+                    "maxPages": self.config.AMAZON_MAX_PAGES,
+                }
+            ]
+        }
 
     def _normalize_products(
         self,
-        scraped_products: List[dict],
+        scraped_products: Iterable[dict],
         region: str,
         keyword: str,
-    ) -> List[ProductMetrics]:
-        """Normalize raw scraped data to ProductMetrics."""
-        if not scraped_products:
-            return []
-
-        if scraped_products[0].get("statusCode") != 200:
-            return []
-
-        normalized = []
-
-        for product in scraped_products:
-            # Parse rating
-            rating_str = product.get("productRating", "0") or "0"
-            rating = float(rating_str.split(" ")[0].replace(",", "."))
-
-            # Parse sales volume
-            raw_volume = (product.get("salesVolume", "0") or "0").split("+")[0]
-            raw_volume_numeric = raw_volume.replace("K", "")
-            if raw_volume_numeric.isdigit():
-                volume_multiplier = 1000 if "K" in raw_volume else 1
-                sales_last_month = int(raw_volume_numeric) * volume_multiplier
-            else:
-                sales_last_month = 0
-
-            normalized.append(
-                ProductMetrics(
-                    keyword_searched=keyword,
-                    platform=Platforms.AMAZON,
-                    unique_id=product.get("asin", ""),
-                    description=product.get("productDescription", "") or "",
-                    price=product.get("price", 0) or 0,
-                    currency=Currencies.USD if region == "us" else Currencies.UNKNOWN,
-                    image_url=product.get("imgUrl", "") or "",
-                    platform_category=product.get("selectedCategory", "") or "",
-                    platform_region=region,
-                    rating=rating,
-                    review_count=product.get("countReview", 0) or 0,
-                    search_ranking=product.get("searchResultPosition", 0) or 0,
-                    sales_last_month=sales_last_month,
-                    sponsored=(product.get("sponsored", False) or product.get("prime", False)),
-                )
-            )
+    ) -> Iterator[ProductMetrics]:
+        """Lazily normalize raw scraped data to ProductMetrics."""
+        iterator = iter(scraped_products)
+
+        first = next(iterator, None)
+        if first is None or first.get("statusCode") != 200:
+            return
+
+        yield self._normalize_product(first, region, keyword)
+        for product in iterator:
+            yield self._normalize_product(product, region, keyword)
+
+    def _normalize_product(self, product: dict, region: str, keyword: str) -> ProductMetrics:
+        """Normalize a single raw scraped item to ProductMetrics."""
+        # Parse rating
+        rating_str = product.get("productRating", "0") or "0"
+        rating = float(rating_str.split(" ")[0].replace(",", "."))
+
+        # Parse sales volume
+        raw_volume = (product.get("salesVolume", "0") or "0").split("+")[0]
+        raw_volume_numeric = raw_volume.replace("K", "")
+        if raw_volume_numeric.isdigit():
+            volume_multiplier = 1000 if "K" in raw_volume else 1
+            sales_last_month = int(raw_volume_numeric) * volume_multiplier
+        else:
+            sales_last_month = 0
+
+        return ProductMetrics(
+            keyword_searched=keyword,
+            platform=Platforms.AMAZON,
+            unique_id=product.get("asin", ""),
+            description=product.get("productDescription", "") or "",
+            price=product.get("price", 0) or 0,
+            currency=Currencies.USD if region == "us" else Currencies.UNKNOWN,
+            image_url=product.get("imgUrl", "") or "",
+            platform_category=product.get("selectedCategory", "") or "",
+            platform_region=region,
+            rating=rating,
+            review_count=product.get("countReview", 0) or 0,
+            search_ranking=product.get("searchResultPosition", 0) or 0,
+            sales_last_month=sales_last_month,
+            sponsored=(product.get("sponsored", False) or product.get("prime", False)),
+        )
+
+
+# Shared instance
+_service: ApifyService | None = None
+_service_lock = threading.Lock()
+
+
+def get_apify_service() -> ApifyService:
+    """Get or create the shared service (closed at interpreter exit)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ApifyService()
+                atexit.register(close_apify_service)
+    return _service
+
 
-        return normalized
+def close_apify_service() -> None:
+    """Close the shared service, if one was created."""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
 
 
 # Convenience function
 def run_amazon_actor(criteria: SearchCriteria) -> List[ProductMetrics]:
-    """Run Amazon scraper using default service."""
-    service = ApifyService()
-    return service.run_amazon_scraper(criteria)
+    """Run Amazon scraper using the shared service."""
+    return get_apify_service().run_amazon_scraper(criteria)
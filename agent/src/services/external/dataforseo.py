@@ -2,7 +2,12 @@
 DataForSEO service for trend exploration.
 """
 
-from typing import List, Sequence, Any, cast
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Mapping, Optional, Sequence, Any, cast
 
 from dataforseo_client import (
     configuration as dfs_config,
@@ -17,54 +22,362 @@ from dataforseo_client.models.keywords_data_dataforseo_trends_explore_live_respo
 )
 
 from config import get_settings
+from config.constants import TRENDS_CONFIG, TrendsConfig
+
+# DataForSEO (Google Ads geo target) location codes by ISO 3166-1 alpha-2
+# region, as extracted into SearchCriteria.target_region. Country codes are
+# 2000 + the ISO numeric code.
+REGION_LOCATION_CODES: Dict[str, int] = {
+    "ae": 2784,
+    "ar": 2032,
+    "at": 2040,
+    "au": 2036,
+    "bd": 2050,
+    "be": 2056,
+    "br": 2076,
+    "ca": 2124,
+    "ch": 2756,
+    "cn": 2156,
+    "de": 2276,
+    "dk": 2208,
+    "eg": 2818,
+    "es": 2724,
+    "fr": 2250,
+    "gb": 2826,
+    "id": 2360,
+    "ie": 2372,
+    "in": 2356,
+    "it": 2380,
+    "jp": 2392,
+    "kr": 2410,
+    "lk": 2144,
+    "mm": 2104,
+    "mx": 2484,
+    "my": 2458,
+    "ng": 2566,
+    "nl": 2528,
+    "no": 2578,
+    "np": 2524,
+    "nz": 2554,
+    "ph": 2608,
+    "pk": 2586,
+    "pl": 2616,
+    "pt": 2620,
+    "sa": 2682,
+    "se": 2752,
+    "sg": 2702,
+    "th": 2764,
+    "tr": 2792,
+    # "uk" is not ISO 3166-1 but is commonly used for gb (e.g. the .uk TLD)
+    "uk": 2826,
+    "us": 2840,
+    "vn": 2704,
+    "za": 2710,
+}
+
+
+def region_location_code(region: str | None, config: TrendsConfig = TRENDS_CONFIG) -> int:
+    """Location code for a target region; ``LOCATION_CODE`` when it isn't known."""
+    return REGION_LOCATION_CODES.get((region or "").strip().lower(), config.LOCATION_CODE)
+
+
+@dataclass
+class TrendPoint:
+    """One point of a keyword's search-interest series."""
+
+    date_from: date
+    date_to: date
+    value: float
 
 
 class DataForSEOService:
-    """Service for interacting with DataForSEO API."""
+    """
+    Service for interacting with DataForSEO API.
+
+    Holds one ``ApiClient`` whose urllib3 pool keeps connections alive
+    between calls; it is safe to share across threads. Use
+    ``get_dataforseo_service`` for the process-wide instance.
+    """
 
-    def __init__(self, username: str | None = None, password: str | None = None):
+    def __init__(
+        self,
+        username: str | None = None,
+        password: str | None = None,
+        config: TrendsConfig = TRENDS_CONFIG,
+    ):
         settings = get_settings()
         self.username = username or settings.dataforseo_username
         self.password = password or settings.dataforseo_password
+        self.config = config
+
+        configuration = dfs_config.Configuration(
+            username=self.username,
+            password=self.password,
+        )
+        # Keep a pooled connection for every concurrent call
+        configuration.connection_pool_maxsize = max(
+            configuration.connection_pool_maxsize or 0,
+            config.MAX_CONCURRENT_REQUESTS,
+        )
+        self.api_client = dfs_api_provider.ApiClient(configuration)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.api_client.rest_client.pool_manager.clear()
 
     def get_trends(
         self,
         keywords: Sequence[str],
+        location_code: int | None = None,
     ) -> KeywordsDataDataforseoTrendsExploreLiveResponseInfo:
         """
         Get trend data for keywords.
 
         Args:
             keywords: List of keywords to analyze
+            location_code: DataForSEO location (default ``LOCATION_CODE``)
 
         Returns:
             DataForSEO trends response
         """
-        configuration = dfs_config.Configuration(
-            username=self.username,
-            password=self.password,
+        return self._explore_live([self._request_info(keywords, location_code=location_code)])
+
+    def get_trends_batch(
+        self,
+        keyword_sets: Sequence[Sequence[str]],
+        location_code: int | None = None,
+    ) -> List[Optional[KeywordsDataDataforseoTrendsExploreLiveResponseInfo]]:
+        """
+        Get trend data for many keyword sets in as few calls as allowed.
+
+        Each keyword set becomes one task; tasks are packed
+        ``TASKS_PER_REQUEST`` to a call and calls run concurrently (up to
+        ``MAX_CONCURRENT_REQUESTS``).
+
+        Args:
+            keyword_sets: One keyword list per cluster
+            location_code: DataForSEO location (default ``LOCATION_CODE``)
+
+        Returns:
+            One response per keyword set, in input order, holding only that
+            set's task (so ``tasks[0]`` is its result). None for empty sets
+            and for tasks missing from the response.
+        """
+        return self._run_tasks(
+            [
+                self._request_info(keywords, location_code=location_code) if keywords else None
+                for keywords in keyword_sets
+            ]
         )
 
-        with dfs_api_provider.ApiClient(configuration) as api_client:
-            request_info = KeywordsDataDataforseoTrendsExploreLiveRequestInfo(
-                keywords=cast(Any, keywords),
-            )
+    def fetch_keyword_series(
+        self,
+        keywords: Sequence[str],
+        date_from: Mapping[str, date] | None = None,
+        location_code: int | None = None,
+    ) -> Dict[str, List[TrendPoint]]:
+        """
+        Fetch one series per keyword (one task each).
 
-            request_list: List[KeywordsDataDataforseoTrendsExploreLiveRequestInfo | None] = [
-                request_info
+        Args:
+            keywords: Keywords to fetch
+            date_from: Optional start date per keyword; keywords without one
+                get the configured ``TIME_RANGE``
+            location_code: DataForSEO location (default ``LOCATION_CODE``)
+
+        Returns:
+            Points per keyword. Keywords whose task failed are left out.
+        """
+        date_from = date_from or {}
+        today = date.today()
+        responses = self._run_tasks(
+            [
+                (
+                    self._request_info(
+                        [keyword],
+                        date_from=date_from[keyword],
+                        date_to=today,
+                        location_code=location_code,
+                    )
+                    if keyword in date_from
+                    else self._request_info([keyword], location_code=location_code)
+                )
+                for keyword in keywords
             ]
+        )
+
+        series: Dict[str, List[TrendPoint]] = {}
+        for keyword, response in zip(keywords, responses):
+            points = _series_points(response)
+            if points is not None:
+                series[keyword] = points
+        return series
+
+    def _request_info(
+        self,
+        keywords: Sequence[str],
+        date_from: date | None = None,
+        date_to: date | None = None,
+        location_code: int | None = None,
+    ) -> KeywordsDataDataforseoTrendsExploreLiveRequestInfo:
+        """
+        Build one Trends Explore task.
+
+        Uses an explicit date range when given, else ``TIME_RANGE``, and the
+        given location, else ``LOCATION_CODE`` (0 = worldwide, sent as none).
+        """
+        if location_code is None:
+            location_code = self.config.LOCATION_CODE
+        return KeywordsDataDataforseoTrendsExploreLiveRequestInfo(
+            keywords=cast(Any, list(keywords)),
+            time_range=None if date_from else self.config.TIME_RANGE,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            location_code=location_code or None,
+        )
+
+    def _run_tasks(
+        self,
+        request_infos: Sequence[KeywordsDataDataforseoTrendsExploreLiveRequestInfo | None],
+    ) -> List[Optional[KeywordsDataDataforseoTrendsExploreLiveResponseInfo]]:
+        """
+        Send tasks in as few calls as allowed and split the responses.
+
+        Tasks are tagged with their position, packed ``TASKS_PER_REQUEST`` to
+        a call, and calls run concurrently (up to ``MAX_CONCURRENT_REQUESTS``).
+        Returns one single-task response per entry (None for None entries
+        and for tasks missing from the response).
+        """
+        tasks = [
+            (index, info.model_copy(update={"tag": str(index)}))
+            for index, info in enumerate(request_infos)
+            if info is not None
+        ]
+        results: List[Optional[KeywordsDataDataforseoTrendsExploreLiveResponseInfo]] = [
+            None
+        ] * len(request_infos)
+        if not tasks:
+            return results
+
+        size = max(1, self.config.TASKS_PER_REQUEST)
+        chunks = [tasks[start : start + size] for start in range(0, len(tasks), size)]
 
-            response = KeywordsDataApi(api_client).dataforseo_trends_explore_live(
-                list_optional_keywords_data_dataforseo_trends_explore_live_request_info=request_list
+        max_workers = min(self.config.MAX_CONCURRENT_REQUESTS, len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            responses = list(
+                pool.map(lambda chunk: self._explore_live([info for _, info in chunk]), chunks)
             )
 
-            return response
+        for chunk, response in zip(chunks, responses):
+            for index, task in self._split_tasks(chunk, response).items():
+                results[index] = task
+
+        return results
+
+    def _explore_live(
+        self,
+        request_list: List[KeywordsDataDataforseoTrendsExploreLiveRequestInfo],
+    ) -> KeywordsDataDataforseoTrendsExploreLiveResponseInfo:
+        """Send one Trends Explore live call with the given tasks."""
+        return KeywordsDataApi(self.api_client).dataforseo_trends_explore_live(
+            list_optional_keywords_data_dataforseo_trends_explore_live_request_info=cast(
+                Any, request_list
+            )
+        )
 
+    def _split_tasks(
+        self,
+        chunk: List[tuple[int, KeywordsDataDataforseoTrendsExploreLiveRequestInfo]],
+        response: KeywordsDataDataforseoTrendsExploreLiveResponseInfo,
+    ) -> Dict[int, KeywordsDataDataforseoTrendsExploreLiveResponseInfo]:
+        """
+        Map each task in a multi-task response back to its keyword set.
 
-# Convenience function
+        Tasks are matched by the ``tag`` echoed in ``task.data``, falling back
+        to their position in the call.
+        """
+        tasks = response.tasks or []
+        by_tag = {str(task.data.get("tag")): task for task in tasks if task and task.data}
+
+        split: Dict[int, KeywordsDataDataforseoTrendsExploreLiveResponseInfo] = {}
+        for position, (index, _) in enumerate(chunk):
+            task = by_tag.get(str(index))
+            if task is None and position < len(tasks):
+                task = tasks[position]
+            if task is None:
+                continue
+            split[index] = response.model_copy(update={"tasks": [task], "tasks_count": 1})
+        return split
+
+
+def _series_points(response: Any) -> Optional[List[TrendPoint]]:
+    """
+    Points of a single-keyword response.
+
+    Returns None when the task failed and an empty list when it succeeded
+    without data.
+    """
+    if not response or not response.tasks or not response.tasks[0]:
+        return None
+
+    task = response.tasks[0]
+    if task.status_code != 20000 or not task.result:
+        return None
+
+    result = task.result[0]
+    items = (result.items if result else None) or []
+    graph = next((item for item in items if item and item.data), None)
+    if graph is None:
+        return []
+
+    return [
+        TrendPoint(
+            date_from=date.fromisoformat(point.date_from),
+            date_to=date.fromisoformat(point.date_to or point.date_from),
+            value=float(sum(v for v in point.values or [] if v is not None)),
+        )
+        for point in graph.data
+        if point and point.date_from
+    ]
+
+
+# Shared instance
+_service: DataForSEOService | None = None
+_service_lock = threading.Lock()
+
+
+def get_dataforseo_service() -> DataForSEOService:
+    """Get or create the shared service (closed at interpreter exit)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = DataForSEOService()
+                atexit.register(close_dataforseo_service)
+    return _service
+
+
+def close_dataforseo_service() -> None:
+    """Close the shared service, if one was created."""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
+
+
+# Convenience functions
 def get_trends(
     keywords: Sequence[str],
+    location_code: int | None = None,
 ) -> KeywordsDataDataforseoTrendsExploreLiveResponseInfo:
-    """Get trends using default service."""
-    service = DataForSEOService()
-    return service.get_trends(keywords)
+    """Get trends using the shared service (see ``region_location_code``)."""
+    return get_dataforseo_service().get_trends(keywords, location_code=location_code)
+
+
+def get_trends_batch(
+    keyword_sets: Sequence[Sequence[str]],
+    location_code: int | None = None,
+) -> List[Optional[KeywordsDataDataforseoTrendsExploreLiveResponseInfo]]:
+    """Get trends for many keyword sets using the shared service."""
+    return get_dataforseo_service().get_trends_batch(keyword_sets, location_code=location_code)
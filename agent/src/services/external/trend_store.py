@@ -0,0 +1,316 @@
+"""
+Trend point warehouse.
+
+Keeps each keyword's search-interest series in ``trend_points`` and tops it
+up with small delta fetches instead of re-downloading the whole window.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from statistics import mean
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from config.constants import TRENDS_CONFIG, TrendsConfig
+from database import get_db, TrendPointDB
+from .dataforseo import (
+    DataForSEOService,
+    TrendPoint,
+    get_dataforseo_service,
+    region_location_code,
+)
+
+# (period start, value) points of one keyword's series, in date order
+SeriesPoints = List[Tuple[date, float]]
+
+# Period assumed for keywords with a single stored point (weekly series)
+DEFAULT_PERIOD = timedelta(days=7)
+
+
+class TrendPointStore:
+    """Reads and writes ``trend_points`` rows of one location."""
+
+    def __init__(self, config: TrendsConfig = TRENDS_CONFIG, location_code: int | None = None):
+        self.config = config
+        self.location_code = config.LOCATION_CODE if location_code is None else location_code
+
+    def load(self, keywords: Sequence[str], since: date) -> Dict[str, SeriesPoints]:
+        """Stored points from ``since`` on, per keyword."""
+        if not keywords:
+            return {}
+
+        with get_db() as session:
+            rows = session.execute(
+                select(TrendPointDB.keyword, TrendPointDB.point_date, TrendPointDB.value)
+                .where(
+                    TrendPointDB.keyword.in_(list(keywords)),
+                    TrendPointDB.location_code == self.location_code,
+                    TrendPointDB.point_date >= since,
+                )
+                .order_by(TrendPointDB.keyword, TrendPointDB.point_date)
+            ).all()
+
+        series: Dict[str, SeriesPoints] = defaultdict(list)
+        for keyword, point_date, value in rows:
+            series[keyword].append((point_date, value))
+        return dict(series)
+
+    def tails(self, keywords: Sequence[str]) -> Dict[str, SeriesPoints]:
+        """Last two stored points per keyword (enough for period and overlap)."""
+        if not keywords:
+            return {}
+
+        ranked = (
+            select(
+                TrendPointDB.keyword,
+                TrendPointDB.point_date,
+                TrendPointDB.value,
+                func.row_number()
+                .over(partition_by=TrendPointDB.keyword, order_by=TrendPointDB.point_date.desc())
+                .label("rank"),
+            )
+            .where(
+                TrendPointDB.keyword.in_(list(keywords)),
+                TrendPointDB.location_code == self.location_code,
+            )
+            .subquery()
+        )
+
+        with get_db() as session:
+            rows = session.execute(
+                select(ranked.c.keyword, ranked.c.point_date, ranked.c.value)
+                .where(ranked.c.rank <= 2)
+                .order_by(ranked.c.keyword, ranked.c.point_date)
+            ).all()
+
+        tails: Dict[str, SeriesPoints] = defaultdict(list)
+        for keyword, point_date, value in rows:
+            tails[keyword].append((point_date, value))
+        return dict(tails)
+
+    def append(self, series: Dict[str, SeriesPoints]) -> None:
+        """Insert new points (replacing any with the same date)."""
+        rows = self._rows(series)
+        if not rows:
+            return
+
+        with get_db() as session:
+            session.execute(self._upsert(rows))
+            session.commit()
+
+    def replace(self, series: Dict[str, SeriesPoints]) -> None:
+        """Replace each keyword's stored series."""
+        if not series:
+            return
+
+        rows = self._rows(series)
+        with get_db() as session:
+            session.execute(
+                delete(TrendPointDB).where(
+                    TrendPointDB.keyword.in_(list(series)),
+                    TrendPointDB.location_code == self.location_code,
+                )
+            )
+            if rows:
+                session.execute(self._upsert(rows))
+            session.commit()
+
+    def _rows(self, series: Dict[str, SeriesPoints]) -> List[dict]:
+        fetched_at = datetime.now(timezone.utc)
+        return [
+            {
+                "keyword": keyword,
+                "location_code": self.location_code,
+                "date": point_date,
+                "value": value,
+                "fetched_at": fetched_at,
+            }
+            for keyword, points in series.items()
+            for point_date, value in points
+        ]
+
+    @staticmethod
+    def _upsert(rows: List[dict]):
+        stmt = insert(TrendPointDB).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[
+                TrendPointDB.keyword,
+                TrendPointDB.location_code,
+                TrendPointDB.point_date,
+            ],
+            set_={
+                "value": stmt.excluded.value,
+                "fetched_at": stmt.excluded.fetched_at,
+            },
+        )
+
+
+class TrendRefresher:
+    """
+    Keeps stored keyword series current and serves them for scoring.
+
+    Unknown keywords (or ones not refreshed for ``DELTA_MAX_DAYS``) are
+    fetched in full. Known keywords only fetch from their last stored
+    period on; that period is fetched again and used to rescale the new
+    points onto the stored series, since every fetch is scaled to its own
+    peak. Keywords with no new complete period cost no request at all.
+
+    Series are fetched and stored for the store's location; without a
+    store, that of ``region`` (see ``region_location_code``).
+    """
+
+    def __init__(
+        self,
+        service: DataForSEOService | None = None,
+        store: TrendPointStore | None = None,
+        config: TrendsConfig = TRENDS_CONFIG,
+        region: str | None = None,
+    ):
+        self.service = service or get_dataforseo_service()
+        self.store = store or TrendPointStore(config, region_location_code(region, config))
+        self.config = config
+
+    def refresh(self, keywords: Sequence[str]) -> None:
+        """Bring the stored series of the given keywords up to date."""
+        today = date.today()
+        tails = self.store.tails(keywords)
+
+        full: List[str] = []
+        deltas: Dict[str, Tuple[date, float, timedelta]] = {}
+        for keyword in keywords:
+            points = tails.get(keyword)
+            if not points or (today - points[-1][0]).days > self.config.DELTA_MAX_DAYS:
+                full.append(keyword)
+                continue
+
+            last_date, last_value = points[-1]
+            period = last_date - points[-2][0] if len(points) > 1 else DEFAULT_PERIOD
+            if last_date + 2 * period <= today:
+                deltas[keyword] = (last_date, last_value, period)
+
+        if not full and not deltas:
+            return
+
+        fetched = self.service.fetch_keyword_series(
+            full + list(deltas),
+            date_from={keyword: last_date for keyword, (last_date, _, _) in deltas.items()},
+            location_code=self.store.location_code,
+        )
+
+        replacements = {
+            keyword: _complete_points(fetched[keyword], today)
+            for keyword in full
+            if keyword in fetched
+        }
+
+        appends: Dict[str, SeriesPoints] = {}
+        rebase: List[str] = []
+        for keyword, (last_date, last_value, period) in deltas.items():
+            if keyword not in fetched:
+                continue
+            points = self._rescale_delta(fetched[keyword], last_date, last_value, period, today)
+            if points is None:
+                rebase.append(keyword)
+            elif points:
+                appends[keyword] = points
+
+        if rebase:
+            refetched = self.service.fetch_keyword_series(
+                rebase, location_code=self.store.location_code
+            )
+            replacements.update(
+                {keyword: _complete_points(points, today) for keyword, points in refetched.items()}
+            )
+
+        self.store.replace(replacements)
+        self.store.append(appends)
+
+    def search_series(self, keyword_sets: Sequence[Sequence[str]]) -> List[Optional[List[float]]]:
+        """
+        Summed search-interest series for many keyword sets.
+
+        Args:
+            keyword_sets: One keyword list per cluster
+
+        Returns:
+            One series per keyword set (None for empty sets), covering the
+            last ``WINDOW_DAYS``
+        """
+        keywords = list(dict.fromkeys(k for keywords in keyword_sets for k in keywords))
+        today = date.today()
+        since = today - timedelta(days=self.config.WINDOW_DAYS)
+
+        if self.config.STORE_ENABLED:
+            self.refresh(keywords)
+            series = self.store.load(keywords, since=since)
+        else:
+            series = {
+                keyword: _complete_points(points, today)
+                for keyword, points in self.service.fetch_keyword_series(
+                    keywords, location_code=self.store.location_code
+                ).items()
+            }
+
+        return [
+            compose_series([series[k] for k in keywords if k in series]) if keywords else None
+            for keywords in keyword_sets
+        ]
+
+    def _rescale_delta(
+        self,
+        points: List[TrendPoint],
+        last_date: date,
+        last_value: float,
+        period: timedelta,
+        today: date,
+    ) -> Optional[SeriesPoints]:
+        """
+        Bucket delta points into stored periods and rescale them.
+
+        The delta window starts at the last stored period, so its first
+        bucket overlaps it; the ratio between the two puts the new buckets on
+        the stored scale. Only complete periods are returned. Returns None
+        when the overlap is too small to rescale reliably.
+        """
+        buckets: Dict[int, List[float]] = defaultdict(list)
+        for point in points:
+            if point.date_from >= last_date:
+                buckets[(point.date_from - last_date).days // period.days].append(point.value)
+
+        overlap = buckets.get(0)
+        minimum = self.config.MIN_OVERLAP_VALUE
+        if not overlap or last_value < minimum or mean(overlap) < minimum:
+            return None
+
+        scale = last_value / mean(overlap)
+        rescaled: SeriesPoints = []
+        for index in sorted(buckets):
+            start = last_date + index * period
+            if index == 0 or start + period > today:
+                continue
+            rescaled.append((start, mean(buckets[index]) * scale))
+        return rescaled
+
+
+def _complete_points(points: List[TrendPoint], today: date) -> SeriesPoints:
+    """Drop the current, still partial period."""
+    return [(point.date_from, point.value) for point in points if point.date_to < today]
+
+
+def compose_series(series: Sequence[SeriesPoints]) -> List[float]:
+    """Sum per-keyword series by date into one series, in date order."""
+    totals: Dict[date, float] = defaultdict(float)
+    for points in series:
+        for point_date, value in points:
+            totals[point_date] += value
+    return [totals[point_date] for point_date in sorted(totals)]
+
+
+# Convenience function
+def get_search_series(
+    keyword_sets: Sequence[Sequence[str]], region: str | None = None
+) -> List[Optional[List[float]]]:
+    """Get summed search series for many keyword sets and a target region."""
+    return TrendRefresher(region=region).search_series(keyword_sets)
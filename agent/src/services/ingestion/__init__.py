@@ -0,0 +1,11 @@
+"""Product ingestion services."""
+
+from .embedding_cache import CachedEmbeddings, get_cached_embeddings_model
+from .pipeline import ProductIngestionPipeline, IngestionResult
+
+__all__ = [
+    "CachedEmbeddings",
+    "get_cached_embeddings_model",
+    "ProductIngestionPipeline",
+    "IngestionResult",
+]
@@ -0,0 +1,106 @@
+"""
+Persistent embedding cache.
+
+Document embeddings are stored in Postgres keyed by a hash of the model
+name and the text, so repeat listings are only embedded once.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from config import get_settings
+from llm import get_embeddings_model, get_embeddings_model_name
+from database import get_db, EmbeddingCacheDB
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends cache misses to the underlying model."""
+
+    def __init__(self, underlying: Embeddings, model_name: str):
+        self.underlying = underlying
+        self.model_name = model_name
+
+    def content_hash(self, text: str) -> str:
+        """Cache key for a text under this model."""
+        return hashlib.sha256(f"{self.model_name}\n{text}".encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, serving repeat texts from the cache."""
+        if not texts:
+            return []
+
+        keys = [self.content_hash(t) for t in texts]
+        vectors = self._load(set(keys))
+
+        # One API input per distinct missing text
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+
+        if missing:
+            fresh = self.underlying.embed_documents(list(missing.values()))
+            new_vectors = dict(zip(missing.keys(), fresh))
+            self._store(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Queries are not cached; they go straight to the underlying model."""
+        return self.underlying.embed_query(text)
+
+    def _load(self, keys: set[str]) -> Dict[str, List[float]]:
+        """Fetch cached vectors for the given keys."""
+        with get_db() as session:
+            rows = session.execute(
+                select(EmbeddingCacheDB.content_hash, EmbeddingCacheDB.embedding).where(
+                    EmbeddingCacheDB.content_hash.in_(keys)
+                )
+            ).all()
+
+        return {key: list(map(float, embedding)) for key, embedding in rows}
+
+    def _store(self, vectors: Dict[str, List[float]]) -> None:
+        """Insert new vectors, ignoring keys another request stored first."""
+        now = datetime.now(timezone.utc)
+        stmt = insert(EmbeddingCacheDB).on_conflict_do_nothing(
+            index_elements=[EmbeddingCacheDB.content_hash]
+        )
+
+        with get_db() as session:
+            session.execute(
+                stmt,
+                [
+                    {
+                        "content_hash": key,
+                        "model": self.model_name,
+                        "embedding": vector,
+                        "created_at": now,
+                    }
+                    for key, vector in vectors.items()
+                ],
+            )
+            session.commit()
+
+
+@lru_cache
+def get_cached_embeddings_model() -> Embeddings:
+    """
+    Get the embeddings model wrapped in the persistent cache.
+
+    The hashing backend is cheaper to recompute than to look up and is
+    returned as is, as is every backend when the cache is disabled in
+    settings.
+    """
+    settings = get_settings()
+    model = get_embeddings_model()
+    if settings.embedding_cache_enabled and settings.embeddings_backend != "hashing":
+        return CachedEmbeddings(model, model_name=get_embeddings_model_name())
+    return model
@@ -0,0 +1,217 @@
+"""
+Product ingestion pipeline.
+
+Streams scraped product batches through deduplication, scoring,
+embedding and bulk insertion, so work on early batches overlaps with
+scraping of later ones.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import update
+
+from config.constants import EMBEDDING_CONFIG, EmbeddingConfig
+from schemas import ProductMetrics, ProductColumns
+from services.scoring import ProductScorer
+from database import get_db, ProductMetricsDB
+from .embedding_cache import get_cached_embeddings_model
+
+# Separator for merged keyword_searched values
+KEYWORD_SEPARATOR = ", "
+KEYWORD_SEARCHED_MAX_LENGTH = 255
+
+ProductKey = Tuple[str, str, str]
+
+
+@dataclass
+class IngestionResult:
+    """Products persisted by a pipeline run, with their database ids."""
+
+    products: List[ProductMetrics] = field(default_factory=list)
+    product_ids: List[int] = field(default_factory=list)
+    # float32 matrix, row i belongs to products[i] / product_ids[i]
+    embeddings: Optional[np.ndarray] = None
+
+
+class ProductIngestionPipeline:
+    """
+    Score, embed and persist products batch by batch.
+
+    Products are deduplicated on ``(platform, unique_id, platform_region)``
+    across the whole stream: only the first copy is embedded and inserted,
+    later copies merge their keyword and best search ranking into it.
+    Each batch of new products is embedded with one ``embed_documents`` call
+    (up to ``MAX_CONCURRENT_BATCHES`` calls in flight) and flushed as a bulk
+    insert. Everything is committed in a single
+    transaction once the stream is exhausted.
+    """
+
+    def __init__(
+        self,
+        request_id: int,
+        embeddings_model: Embeddings | None = None,
+        config: EmbeddingConfig = EMBEDDING_CONFIG,
+    ):
+        self.request_id = request_id
+        self.embeddings_model = embeddings_model or get_cached_embeddings_model()
+        self.config = config
+        self.scorer = ProductScorer()
+
+    def run(self, batches: Iterable[Tuple[str, List[ProductMetrics]]]) -> IngestionResult:
+        """
+        Consume a stream of (keyword, products) batches.
+
+        Each batch's embedding call is submitted to a pool of
+        ``MAX_CONCURRENT_BATCHES`` workers, so embedding overlaps with
+        scraping the next batches; batches are scored and inserted in stream
+        order as their embeddings arrive.
+
+        Args:
+            batches: Product batches, e.g. from ApifyService.stream_amazon_scraper
+
+        Returns:
+            IngestionResult with all persisted products and their ids
+        """
+        result = IngestionResult()
+        # Products kept so far (inserted, then pending), in stream order
+        accepted: List[ProductMetrics] = []
+        seen: Dict[ProductKey, int] = {}
+        merged: Set[int] = set()
+        vector_batches: List[np.ndarray] = []
+        pending: Deque[Tuple[List[ProductMetrics], Future]] = deque()
+        max_in_flight = max(1, self.config.MAX_CONCURRENT_BATCHES)
+
+        with get_db() as session, ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+
+            def insert_next() -> None:
+                products, future = pending.popleft()
+                vectors = future.result()
+                # Scored now so duplicates merged while embedding count
+                self._score(products)
+                for offset, product in enumerate(products):
+                    product.embedding_row = len(result.products) + offset
+                vector_batches.append(vectors)
+
+                db_products = [self._to_db(p, v) for p, v in zip(products, vectors)]
+                session.add_all(db_products)
+                session.flush()
+
+                result.products.extend(products)
+                result.product_ids.extend(p.id for p in db_products)
+
+                # Persisted rows are not needed in the identity map any more
+                session.expunge_all()
+
+            for _, batch in batches:
+                products: List[ProductMetrics] = []
+                for product in batch:
+                    key = self._dedup_key(product)
+                    if key is None or key not in seen:
+                        if key is not None:
+                            seen[key] = len(accepted)
+                        accepted.append(product)
+                        products.append(product)
+                        continue
+
+                    index = seen[key]
+                    self._merge(accepted[index], product)
+                    if index < len(result.products):
+                        merged.add(index)
+
+                if not products:
+                    continue
+
+                descriptions = [p.description for p in products]
+                pending.append((products, pool.submit(self._embed, descriptions)))
+                while len(pending) >= max_in_flight:
+                    insert_next()
+
+            while pending:
+                insert_next()
+
+            if merged:
+                self._update_merged(session, result, sorted(merged))
+
+            session.commit()
+
+        if vector_batches:
+            result.embeddings = np.concatenate(vector_batches)
+
+        return result
+
+    def _dedup_key(self, product: ProductMetrics) -> ProductKey | None:
+        """Identity of a listing across keywords; None if it has no id."""
+        if not product.unique_id:
+            return None
+        return (str(product.platform), product.unique_id, product.platform_region)
+
+    def _merge(self, target: ProductMetrics, duplicate: ProductMetrics) -> None:
+        """Fold a duplicate listing's keyword and ranking into the kept copy."""
+        if duplicate.search_ranking and (
+            not target.search_ranking or duplicate.search_ranking < target.search_ranking
+        ):
+            target.search_ranking = duplicate.search_ranking
+
+        keywords = target.keyword_searched.split(KEYWORD_SEPARATOR)
+        if duplicate.keyword_searched not in keywords:
+            joined = KEYWORD_SEPARATOR.join([*keywords, duplicate.keyword_searched])
+            if len(joined) <= KEYWORD_SEARCHED_MAX_LENGTH:
+                target.keyword_searched = joined
+
+    def _update_merged(self, session, result: IngestionResult, indexes: List[int]) -> None:
+        """Re-score already inserted products that absorbed later duplicates."""
+        products = [result.products[i] for i in indexes]
+        self._score(products)
+
+        session.execute(
+            update(ProductMetricsDB),
+            [
+                {
+                    "id": result.product_ids[i],
+                    "keyword_searched": p.keyword_searched,
+                    "search_ranking": p.search_ranking,
+                    "score": p.score,
+                }
+                for i, p in zip(indexes, products)
+            ],
+        )
+
+    def _score(self, products: List[ProductMetrics]) -> None:
+        """Calculate product scores in place, one vectorized pass per batch."""
+        if not products:
+            return
+        scores = self.scorer.calculate_scores(ProductColumns.from_products(products))
+        for product, score in zip(products, scores.tolist()):
+            product.score = score
+
+    def _embed(self, descriptions: List[str]) -> np.ndarray:
+        """Embed product descriptions into a float32 matrix."""
+        vectors = self.embeddings_model.embed_documents(descriptions)
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _to_db(self, p: ProductMetrics, embedding: np.ndarray) -> ProductMetricsDB:
+        """Convert a schema product to its database row."""
+        return ProductMetricsDB(
+            keyword_searched=p.keyword_searched,
+            platform=(p.platform.value if hasattr(p.platform, "value") else p.platform),
+            unique_id=p.unique_id,
+            description=p.description,
+            price=p.price,
+            currency=(p.currency.value if hasattr(p.currency, "value") else p.currency),
+            image_url=p.image_url,
+            platform_category=p.platform_category,
+            platform_region=p.platform_region,
+            rating=p.rating,
+            review_count=p.review_count,
+            sales_last_month=p.sales_last_month,
+            search_ranking=p.search_ranking,
+            sponsored=p.sponsored,
+            score=p.score,
+            request_id=self.request_id,
+            embedding=embedding,
+        )
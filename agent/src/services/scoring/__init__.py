@@ -1,10 +1,14 @@
 """Scoring services."""
 
 from .product_scorer import ProductScorer, calculate_product_score
-from .trend_scorer import TrendScorer
+from .trend_scorer import TrendScorer, TrendBatchResult, stack_series
+from .rescore import rescore_products
 
 __all__ = [
     "ProductScorer",
     "TrendScorer",
+    "TrendBatchResult",
+    "stack_series",
     "calculate_product_score",
+    "rescore_products",
 ]
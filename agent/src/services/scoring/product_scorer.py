@@ -7,6 +7,9 @@ Calculates a composite score for products based on demand, velocity, and frictio
 import math
 from typing import Protocol
 
+import numpy as np
+
+from schemas import ProductColumns
 from config.constants import PRODUCT_SCORER_CONFIG, ProductScorerConfig
 
 
@@ -47,6 +50,47 @@ class ProductScorer:
 
         return math.floor(demand + velocity + friction)
 
+    def calculate_scores(self, columns: ProductColumns) -> np.ndarray:
+        """
+        Calculate scores for many products at once.
+
+        Vectorized ``calculate_score``: same formula and operation order, so
+        the results are identical.
+
+        Args:
+            columns: Product columns (sales, reviews, ranking, sponsored,
+                description length are used)
+
+        Returns:
+            int64 array of scores from 0-100
+        """
+        config = self.config
+        sales = columns.sales_last_month
+        reviews = columns.review_count
+
+        # Demand
+        normalized = np.log10(np.maximum(1, sales)) / config.DEMAND_MAX_LOG
+        demand = np.minimum(config.DEMAND_WEIGHT, config.DEMAND_WEIGHT * normalized)
+
+        # Velocity
+        velocity_ratio = (sales / (reviews + config.REVIEW_SMOOTHER)) * config.VELOCITY_SCALER
+        velocity = np.minimum(config.VELOCITY_WEIGHT, config.VELOCITY_WEIGHT * velocity_ratio)
+
+        # Friction
+        friction_rank = np.minimum(
+            config.FRICTION_WEIGHT / 2,
+            columns.search_ranking / config.FRICTION_RANK_DIVIDER,
+        )
+        friction_flaws = np.where(columns.sponsored, 0, config.FRICTION_FLAW_SPONSORED)
+        friction_flaws = friction_flaws + np.where(
+            columns.description_length < 100, config.FRICTION_FLAG_DESCRIPTION, 0
+        )
+        friction = np.minimum(
+            config.FRICTION_WEIGHT, config.FRICTION_WEIGHT * (friction_rank + friction_flaws)
+        )
+
+        return np.floor(demand + velocity + friction).astype(np.int64)
+
     def _calculate_demand(self, product: ProductLike) -> float:
         """Calculate demand component based on sales volume."""
         sales = max(1, product.sales_last_month)
@@ -0,0 +1,65 @@
+"""
+Bulk re-scoring of stored products.
+
+Recomputes ``product_metrics.score`` with the current ``ProductScorerConfig``,
+e.g. after tuning its weights.
+"""
+
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import update
+
+from database import get_db, ProductMetricsDB, load_product_columns
+from .product_scorer import ProductScorer
+
+
+def rescore_products(
+    scorer: Optional[ProductScorer] = None,
+    request_id: Optional[int] = None,
+    batch_size: int = 10_000,
+    dry_run: bool = False,
+) -> int:
+    """
+    Re-score stored products in id-ordered batches.
+
+    Each batch is loaded as columns, scored in one vectorized pass, and only
+    rows whose score changed are written back (one commit per batch).
+
+    Args:
+        scorer: Scorer to use (default: current config)
+        request_id: Restrict to one request (default: whole table)
+        batch_size: Rows per batch
+        dry_run: Count changes without writing them
+
+    Returns:
+        Number of products whose score changed
+    """
+    scorer = scorer or ProductScorer()
+    changed_total = 0
+    after_id = 0
+
+    with get_db() as session:
+        while True:
+            ids, columns = load_product_columns(
+                session, request_id=request_id, after_id=after_id, limit=batch_size
+            )
+            if len(ids) == 0:
+                break
+            after_id = int(ids[-1])
+
+            scores = scorer.calculate_scores(columns)
+            changed = np.flatnonzero(scores != columns.score)
+            changed_total += len(changed)
+
+            if len(changed) and not dry_run:
+                session.execute(
+                    update(ProductMetricsDB),
+                    [
+                        {"id": pid, "score": score}
+                        for pid, score in zip(ids[changed].tolist(), scores[changed].tolist())
+                    ],
+                )
+                session.commit()
+
+    return changed_total
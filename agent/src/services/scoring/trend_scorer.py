@@ -4,7 +4,8 @@ Trend scoring service.
 Analyzes search trends and market data to score product clusters.
 """
 
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from scipy.stats import linregress
@@ -14,6 +15,71 @@ from config.constants import TREND_SCORER_CONFIG, TrendScorerConfig
 
 import matplotlib.pyplot as plt
 
+# Trend classes as (label, explanation)
+DEAD = ("Dead 💀", "Low search volume and negligible sales.")
+SATURATED_LABEL = "Saturated 🛑"
+DECLINING = ("Declining 📉", "Search interest is actively dropping.")
+VIRAL = ("Viral 🚀", "Explosive growth with high social volatility.")
+GROWTH = ("Growth 🔥", "Steady, reliable upward trend.")
+STABLE = ("Stable 🟢", "Flat search trend but proven consistent sales.")
+SPECULATIVE = (
+    "Speculative 🎲",
+    "High search interest but low Amazon supply. Opportunity?",
+)
+UNKNOWN = ("Unknown ❓", "Data inconclusive.")
+
+
+def _saturated(reviews: int) -> Tuple[str, str]:
+    return SATURATED_LABEL, f"High competition ({reviews} avg reviews). Hard to enter."
+
+
+@dataclass
+class TrendBatchResult:
+    """Trend analytics for many clusters, one array entry per cluster."""
+
+    final_score: np.ndarray
+    search_score: np.ndarray
+    market_score: np.ndarray
+    slope: np.ndarray
+    volatility: np.ndarray
+    recent_strength: np.ndarray
+    sales_volume: np.ndarray
+    saturation_ratio: np.ndarray
+    labels: List[str]
+    explanations: List[str]
+
+    def to_analytics(self) -> List[TrendAnalyticsData]:
+        """Per-cluster analytics, rounded like ``TrendScorer.analyze``."""
+        return [
+            TrendAnalyticsData(
+                final_score=int(self.final_score[i]),
+                label=self.labels[i],
+                explanation=self.explanations[i],
+                search_score=round(float(self.search_score[i]), 2),
+                market_score=round(float(self.market_score[i]), 2),
+                slope=round(float(self.slope[i]), 2),
+                volatility=round(float(self.volatility[i]), 2),
+                sales_volume=int(self.sales_volume[i]),
+                saturation_ratio=round(float(self.saturation_ratio[i]), 2),
+            )
+            for i in range(len(self.labels))
+        ]
+
+
+def stack_series(series: Sequence[Optional[Sequence[float]]]) -> np.ndarray:
+    """
+    Stack series of different lengths for ``TrendScorer.analyze_batch``.
+
+    Rows are right-aligned (so every row ends at its latest point) and
+    left-padded with NaN; None becomes an all-NaN row.
+    """
+    width = max((len(s) for s in series if s is not None), default=0)
+    stacked = np.full((len(series), width), np.nan)
+    for row, values in enumerate(series):
+        if values:
+            stacked[row, width - len(values) :] = values
+    return stacked
+
 
 class TrendScorer:
     """
@@ -49,6 +115,37 @@ class TrendScorer:
         # 1. Extract search metrics from API response
         items = self._extract_items(trends_response)
         search_metrics = self._calculate_search_metrics(items)
+
+        return self._score(search_metrics, average_sales, average_reviews)
+
+    def analyze_series(
+        self,
+        search_series: Sequence[float],
+        average_sales: int,
+        average_reviews: int,
+    ) -> TrendAnalyticsData:
+        """
+        Analyze a summed search-interest series and market data.
+
+        Args:
+            search_series: Search interest per time point, summed over the
+                cluster's keywords (e.g. composed from stored per-keyword series)
+            average_sales: Average monthly sales for the cluster
+            average_reviews: Average review count for the cluster
+
+        Returns:
+            TrendAnalyticsData with scores and classification
+        """
+        search_metrics = self._series_metrics(list(search_series))
+        return self._score(search_metrics, average_sales, average_reviews)
+
+    def _score(
+        self,
+        search_metrics: Dict[str, float],
+        average_sales: int,
+        average_reviews: int,
+    ) -> TrendAnalyticsData:
+        """Combine search metrics with market data into the final analytics."""
         search_score = self._compute_search_score(search_metrics)
 
         # 2. Calculate market score
@@ -83,6 +180,146 @@ class TrendScorer:
             saturation_ratio=round(saturation_ratio, 2),
         )
 
+    def analyze_batch(
+        self,
+        search_series: np.ndarray,
+        average_sales: Sequence[int] | np.ndarray,
+        average_reviews: Sequence[int] | np.ndarray,
+    ) -> TrendBatchResult:
+        """
+        Analyze many clusters at once with NumPy.
+
+        Gives the same results as ``analyze_series`` row by row. Series of
+        different lengths can be left-padded with NaN (missing points are
+        skipped, as if the row held only its valid points).
+
+        Args:
+            search_series: 2-D array, clusters x time points
+            average_sales: Average monthly sales per cluster
+            average_reviews: Average review count per cluster
+
+        Returns:
+            TrendBatchResult with one entry per cluster
+        """
+        y = np.asarray(search_series, dtype=np.float64)
+        if y.ndim != 2:
+            raise ValueError("search_series must be a 2-D array (clusters x time points)")
+        sales = np.asarray(average_sales, dtype=np.int64)
+        reviews = np.asarray(average_reviews, dtype=np.int64)
+
+        slope, volatility, recent = self._batch_series_metrics(y)
+
+        # Search score ("Viral Reward")
+        swing = np.abs(slope) * 10 + volatility * 0.5
+        search_score = np.clip(np.where(slope > 0, recent + swing, recent - swing), 0.0, 100.0)
+
+        # Market score
+        with np.errstate(divide="ignore"):
+            sales_score = np.minimum(100.0, (np.log10(sales + 1) / 3.0) * 100)
+        saturation_ratio = np.minimum(1.0, reviews / self.config.SATURATION_LIMIT)
+        market_score = np.where(
+            sales == 0, 0.0, np.maximum(0.0, sales_score * (1.0 - (saturation_ratio * 0.8)))
+        )
+
+        final_score = np.trunc(
+            (search_score * self.config.W_SEARCH) + (market_score * self.config.W_MARKET)
+        ).astype(np.int64)
+
+        labels, explanations = self._batch_classify(slope, volatility, sales, reviews, search_score)
+
+        return TrendBatchResult(
+            final_score=final_score,
+            search_score=search_score,
+            market_score=market_score,
+            slope=slope,
+            volatility=volatility,
+            recent_strength=recent,
+            sales_volume=sales,
+            saturation_ratio=saturation_ratio,
+            labels=labels,
+            explanations=explanations,
+        )
+
+    def _batch_series_metrics(self, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Slope, volatility and recent strength for every row (NaN = missing).
+
+        Rows are grouped by their number of valid points and each group goes
+        through the same operations as ``_series_metrics`` (``linregress``
+        takes its slope from ``np.cov``), so results match it exactly rather
+        than to within rounding.
+        """
+        n_rows = y.shape[0]
+        slope = np.zeros(n_rows)
+        volatility = np.zeros(n_rows)
+        recent = np.zeros(n_rows)
+
+        # Valid points first, in their original order
+        valid = ~np.isnan(y)
+        order = np.argsort(~valid, axis=1, kind="stable")
+        packed = np.take_along_axis(y, order, axis=1)
+        count = valid.sum(axis=1)
+
+        for length in np.unique(count[count > 0]):
+            rows = np.flatnonzero(count == length)
+            values = packed[rows, :length]
+            has_data = values.sum(axis=1) != 0
+            rows, values = rows[has_data], values[has_data]
+            if not len(rows):
+                continue
+
+            # Normalize to 0-100 scale
+            norm = (values / values.max(axis=1)[:, None]) * 100
+
+            # Least-squares slope, as np.cov(x, y, bias=1) computes it
+            if length > 1:
+                xy = np.empty((len(rows), 2, length))
+                xy[:, 0] = np.arange(length, dtype=np.float64)
+                xy[:, 1] = norm
+                xy -= xy.mean(axis=2)[:, :, None]
+                cov = xy @ xy.transpose(0, 2, 1)
+                cov *= np.true_divide(1, length)
+                slope[rows] = cov[:, 0, 1] / cov[:, 0, 0]
+
+            # Population standard deviation
+            volatility[rows] = np.std(norm, axis=1)
+            recent[rows] = norm[:, -1]
+
+        return slope, volatility, recent
+
+    def _batch_classify(
+        self,
+        slope: np.ndarray,
+        volatility: np.ndarray,
+        sales: np.ndarray,
+        reviews: np.ndarray,
+        search_score: np.ndarray,
+    ) -> Tuple[List[str], List[str]]:
+        """Vectorized ``_classify_trend``: same rules, same priority order."""
+        min_sales = self.config.MIN_SALES_PROOF
+        conditions = [
+            (sales < min_sales) & (search_score < 40),
+            reviews > self.config.SATURATION_LIMIT,
+            slope < -2,
+            (slope > 5) & (volatility > self.config.VIRALITY_THRESHOLD),
+            slope > 3,
+            (slope >= -2) & (slope < 3) & (sales > min_sales),
+            (search_score > 70) & (sales < min_sales),
+        ]
+        classes = [DEAD, None, DECLINING, VIRAL, GROWTH, STABLE, SPECULATIVE]
+        picked = np.select(conditions, np.arange(len(conditions)), default=-1)
+
+        labels: List[str] = []
+        explanations: List[str] = []
+        for row, index in enumerate(picked):
+            if index == 1:
+                label, explanation = _saturated(int(reviews[row]))
+            else:
+                label, explanation = classes[index] if index >= 0 else UNKNOWN
+            labels.append(label)
+            explanations.append(explanation)
+        return labels, explanations
+
     def _extract_items(self, trends_response: Any) -> Optional[Any]:
         """Extract items from the trends API response."""
         if not trends_response:
@@ -122,6 +359,12 @@ class TrendScorer:
             else:
                 y_values.append(0)
 
+        return self._series_metrics(y_values)
+
+    def _series_metrics(self, y_values: List[float]) -> Dict[str, float]:
+        """Slope, volatility and recent strength of a summed search series."""
+        default = {"slope": 0.0, "volatility": 0.0, "recent_strength": 0.0}
+
         if not y_values or sum(y_values) == 0:
             return default
 
@@ -198,35 +441,29 @@ class TrendScorer:
 
         # Priority 1: Market Killers
         if sales < self.config.MIN_SALES_PROOF and search_score < 40:
-            return "Dead 💀", "Low search volume and negligible sales."
+            return DEAD
 
         if reviews > self.config.SATURATION_LIMIT:
-            return (
-                "Saturated 🛑",
-                f"High competition ({reviews} avg reviews). Hard to enter.",
-            )
+            return _saturated(reviews)
 
         # Priority 2: Downward Trends
         if slope < -2:
-            return "Declining 📉", "Search interest is actively dropping."
+            return DECLINING
 
         # Priority 3: Positive Trends
         if slope > 5 and volatility > self.config.VIRALITY_THRESHOLD:
-            return "Viral 🚀", "Explosive growth with high social volatility."
+            return VIRAL
 
         if slope > 3:
-            return "Growth 🔥", "Steady, reliable upward trend."
+            return GROWTH
 
         if -2 <= slope < 3 and sales > self.config.MIN_SALES_PROOF:
-            return "Stable 🟢", "Flat search trend but proven consistent sales."
+            return STABLE
 
         if search_score > 70 and sales < self.config.MIN_SALES_PROOF:
-            return (
-                "Speculative 🎲",
-                "High search interest but low Amazon supply. Opportunity?",
-            )
+            return SPECULATIVE
 
-        return "Unknown ❓", "Data inconclusive."
+        return UNKNOWN
 
     def plot_and_save_graph(self, x: list[int], y: list[float]):
         (line,) = plt.plot(x, y, "o", markersize=3, label=f"Data")
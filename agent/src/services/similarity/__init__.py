@@ -0,0 +1,7 @@
+"""Similarity search services."""
+
+from .search import SimilarProductsService
+
+__all__ = [
+    "SimilarProductsService",
+]
@@ -0,0 +1,116 @@
+"""
+Similar-products search over all stored requests.
+
+Queries are answered by the HNSW index on ``product_metrics.embedding``
+(cosine distance), so lookups stay fast as the table grows.
+"""
+
+from typing import List, Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session, defer
+
+from config.constants import VECTOR_INDEX_CONFIG, VectorIndexConfig
+from schemas import SimilarProduct
+from llm import get_embeddings_model
+from database import get_db, ProductMetricsDB, product_from_db
+
+# Largest hnsw.ef_search pgvector accepts
+MAX_EF_SEARCH = 1000
+
+
+class SimilarProductsService:
+    """Top-k nearest stored products for a product or a free-text query."""
+
+    def __init__(
+        self,
+        embeddings_model: Embeddings | None = None,
+        config: VectorIndexConfig = VECTOR_INDEX_CONFIG,
+    ):
+        self._embeddings_model = embeddings_model
+        self.config = config
+
+    @property
+    def embeddings_model(self) -> Embeddings:
+        """Embeddings model, created on first free-text query."""
+        if self._embeddings_model is None:
+            self._embeddings_model = get_embeddings_model()
+        return self._embeddings_model
+
+    def similar_to_product(
+        self,
+        product_id: int,
+        k: Optional[int] = None,
+    ) -> List[SimilarProduct]:
+        """
+        Find products similar to a stored product.
+
+        Args:
+            product_id: Id of a product_metrics row
+            k: Number of results (defaults to SIMILAR_PRODUCTS_LIMIT)
+
+        Returns:
+            Nearest products, closest first, excluding the product itself
+        """
+        with get_db() as session:
+            vector = session.scalar(
+                select(ProductMetricsDB.embedding).where(ProductMetricsDB.id == product_id)
+            )
+            if vector is None:
+                return []
+            return self._search(session, vector, k, exclude_id=product_id)
+
+    def similar_to_text(self, query: str, k: Optional[int] = None) -> List[SimilarProduct]:
+        """
+        Find products similar to a free-text query.
+
+        Args:
+            query: Text to embed and search for
+            k: Number of results (defaults to SIMILAR_PRODUCTS_LIMIT)
+
+        Returns:
+            Nearest products, closest first
+        """
+        vector = self.embeddings_model.embed_query(query)
+        with get_db() as session:
+            return self._search(session, vector, k)
+
+    def _search(
+        self,
+        session: Session,
+        vector: Sequence[float],
+        k: Optional[int],
+        exclude_id: Optional[int] = None,
+    ) -> List[SimilarProduct]:
+        """Run an ORDER BY distance LIMIT k query against the HNSW index."""
+        limit = k or self.config.SIMILAR_PRODUCTS_LIMIT
+
+        # The index scan returns at most ef_search rows, and exclude_id is
+        # filtered after it, so the candidate list must cover both
+        ef_search = min(
+            MAX_EF_SEARCH,
+            max(int(self.config.HNSW_EF_SEARCH), limit + (1 if exclude_id is not None else 0)),
+        )
+        # SET LOCAL only lasts for this transaction; it can't take bind params
+        session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+        distance = ProductMetricsDB.embedding.cosine_distance(vector).label("distance")
+        stmt = (
+            select(ProductMetricsDB, distance)
+            .options(defer(ProductMetricsDB.embedding))
+            .order_by(distance)
+            .limit(limit)
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(ProductMetricsDB.id != exclude_id)
+
+        return [
+            SimilarProduct(
+                product_id=db_product.id,
+                request_id=db_product.request_id,
+                distance=float(dist),
+                product=product_from_db(db_product),
+            )
+            for db_product, dist in session.execute(stmt).all()
+        ]
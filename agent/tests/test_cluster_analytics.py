@@ -0,0 +1,47 @@
+"""ClusterAnalyticsService.compute_batch against compute_analytics."""
+
+import numpy as np
+import pytest
+
+from schemas import ProductColumns, ProductMetrics
+from services.clustering.analytics import ClusterAnalyticsService
+
+
+def test_compute_batch_matches_compute_analytics():
+    rng = np.random.default_rng(0)
+    products = [
+        ProductMetrics(
+            price=round(float(rng.uniform(1, 300)), 2),
+            rating=round(float(rng.uniform(0, 5)), 1),
+            review_count=int(rng.integers(0, 30_000)),
+            sales_last_month=int(rng.integers(0, 5_000)),
+            search_ranking=int(rng.integers(1, 200)),
+            score=float(rng.integers(0, 100)),
+        )
+        for _ in range(3000)
+    ]
+    labels = rng.integers(-1, 150, len(products))
+    search_series = {
+        label: rng.integers(0, 100, int(rng.integers(1, 53))).astype(float).tolist()
+        for label in range(0, 150, 2)
+    }
+    # Slope exactly on the Viral/Growth threshold
+    search_series[0] = [5.0 * i for i in range(21)]
+
+    service = ClusterAnalyticsService()
+    batch = service.compute_batch(ProductColumns.from_products(products), labels, search_series)
+
+    assert sorted(batch) == sorted(set(labels.tolist()) - {-1})
+    for label, analytics in batch.items():
+        members = [p for p, lab in zip(products, labels) if lab == label]
+        expected = service.compute_analytics(members, search_series=search_series.get(label))
+
+        assert analytics.trend_analytics == expected.trend_analytics
+        assert analytics.cluster_size == expected.cluster_size
+        assert analytics.average_sales_last_month == expected.average_sales_last_month
+        assert analytics.average_review_count == expected.average_review_count
+        assert analytics.min_price == expected.min_price
+        assert analytics.max_price == expected.max_price
+        # Means agree up to float summation order
+        assert analytics.average_price == pytest.approx(expected.average_price, abs=0.01)
+        assert analytics.average_rating == pytest.approx(expected.average_rating, abs=0.01)
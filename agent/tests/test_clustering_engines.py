@@ -0,0 +1,25 @@
+"""Clustering engine registry and base class."""
+
+import numpy as np
+import pytest
+
+from config.constants import CLUSTERER_CONFIG
+from services.clustering.engines import ClusteringEngine, get_clustering_engine
+
+
+def test_engine_without_fit_predict_cannot_be_instantiated():
+    class Incomplete(ClusteringEngine):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_default_engine_clusters_unit_vectors():
+    rng = np.random.default_rng(0)
+    centers = np.eye(4)
+    points = np.repeat(centers, 20, axis=0) + rng.normal(0, 0.01, (80, 4))
+
+    labels = get_clustering_engine(CLUSTERER_CONFIG).fit_predict(points)
+
+    assert len(set(labels.tolist()) - {-1}) == 4
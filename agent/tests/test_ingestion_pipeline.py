@@ -0,0 +1,122 @@
+"""ProductIngestionPipeline: concurrent embedding of streamed batches."""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.constants import EMBEDDING_CONFIG
+from schemas import ProductMetrics
+from services.ingestion import pipeline as pipeline_module
+from services.ingestion.pipeline import ProductIngestionPipeline
+
+
+class _Session:
+    """Stands in for a database session; flush assigns ids."""
+
+    def __init__(self):
+        self.rows: List[object] = []
+
+    def add_all(self, rows):
+        self.rows.extend(rows)
+
+    def flush(self):
+        for index, row in enumerate(self.rows, start=1):
+            row.id = index
+
+    def expunge_all(self):
+        pass
+
+    def execute(self, *args, **kwargs):
+        pass
+
+    def commit(self):
+        pass
+
+
+class _SlowEmbeddings(Embeddings):
+    """Embeds each text as [len(text), 0]; records how many calls overlap."""
+
+    def __init__(self, in_flight_target: int):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.all_started = threading.Event()
+        self.in_flight_target = in_flight_target
+
+    def embed_documents(self, texts):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.in_flight >= self.in_flight_target:
+                self.all_started.set()
+        # Hold the call until enough others are running (or give up)
+        self.all_started.wait(timeout=2)
+        with self.lock:
+            self.in_flight -= 1
+        return [[float(len(text)), 0.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 0.0]
+
+
+def _batches(count: int, size: int):
+    for b in range(count):
+        yield f"kw{b}", [
+            ProductMetrics(
+                unique_id=f"id{b}-{i}",
+                description="x" * (b * size + i + 1),
+                keyword_searched=f"kw{b}",
+                sales_last_month=10,
+            )
+            for i in range(size)
+        ]
+
+
+def test_stream_batches_are_embedded_concurrently(monkeypatch):
+    session = _Session()
+
+    @contextmanager
+    def fake_db():
+        yield session
+
+    monkeypatch.setattr(pipeline_module, "get_db", fake_db)
+    model = _SlowEmbeddings(in_flight_target=3)
+    config = replace(EMBEDDING_CONFIG, MAX_CONCURRENT_BATCHES=3)
+
+    result = ProductIngestionPipeline(1, embeddings_model=model, config=config).run(
+        _batches(6, 50)
+    )
+
+    assert model.max_in_flight == 3
+    # Inserted in stream order, each row with its own embedding
+    assert len(result.products) == 300
+    assert result.product_ids == list(range(1, 301))
+    np.testing.assert_array_equal(result.embeddings[:, 0], np.arange(1, 301))
+    assert [p.embedding_row for p in result.products] == list(range(300))
+
+
+def test_duplicates_merge_into_pending_batches(monkeypatch):
+    session = _Session()
+
+    @contextmanager
+    def fake_db():
+        yield session
+
+    monkeypatch.setattr(pipeline_module, "get_db", fake_db)
+    model = _SlowEmbeddings(in_flight_target=1)
+
+    first = ProductMetrics(unique_id="a", description="one", keyword_searched="kw1")
+    duplicate = ProductMetrics(
+        unique_id="a", description="one", keyword_searched="kw2", search_ranking=3
+    )
+    result = ProductIngestionPipeline(1, embeddings_model=model).run(
+        [("kw1", [first]), ("kw2", [duplicate])]
+    )
+
+    assert len(result.products) == 1
+    assert result.products[0].keyword_searched == "kw1, kw2"
+    assert result.products[0].search_ranking == 3
@@ -0,0 +1,58 @@
+"""KeywordCorpus weighting and merging of committed updates."""
+
+from collections import Counter
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from services.clustering.keyword_corpus import (
+    KeywordCorpus,
+    KeywordCorpusUpdate,
+    document_terms,
+)
+
+DOCUMENTS = [
+    "led desk lamp dimmable".split(),
+    "desk lamp usb charger".split(),
+    "wireless charger pad".split(),
+    "led strip lights".split(),
+    "gaming desk mat".split(),
+]
+
+
+def _corpus(documents, max_df=1.0):
+    frequencies = Counter(term for words in documents for term in set(document_terms(words)))
+    return KeywordCorpus("home", "us", len(documents), frequencies, max_df)
+
+
+def test_transform_matches_fitted_tfidf():
+    corpus = _corpus(DOCUMENTS)
+    vectorizer = TfidfVectorizer(analyzer=document_terms)
+    expected = vectorizer.fit_transform(DOCUMENTS)
+
+    assert list(corpus.terms) == list(vectorizer.get_feature_names_out())
+    np.testing.assert_allclose(corpus.transform(DOCUMENTS).toarray(), expected.toarray())
+
+
+def test_merged_applies_update_and_bounds():
+    corpus = _corpus(DOCUMENTS, max_df=0.5)
+    assert "desk" not in corpus.vocabulary  # 3 of 5 documents
+
+    update = KeywordCorpusUpdate(
+        vertical="home",
+        region="us",
+        documents=1,
+        document_count=8,
+        frequencies={"charger": 4, "led": 1, "yoga mat": 2},
+    )
+    merged = corpus.merged(update)
+
+    assert merged.document_count == 8
+    assert merged.frequencies["charger"] == 4
+    # Counts never go back down
+    assert merged.frequencies["led"] == 2
+    assert merged.frequencies["yoga mat"] == 2
+    # The upper bound follows the new document count
+    assert "desk" in merged.vocabulary
+    # The cached corpus is left as it was
+    assert corpus.frequencies["charger"] == 2 and corpus.document_count == 5
@@ -0,0 +1,40 @@
+"""ProductScorer.calculate_scores against calculate_score."""
+
+import random
+
+import numpy as np
+
+from schemas import ProductColumns, ProductMetrics
+from services.scoring.product_scorer import ProductScorer
+
+
+def _random_products(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        ProductMetrics(
+            description="x" * rng.choice([0, 50, 99, 100, 101, 300]),
+            price=round(rng.uniform(0, 500), 2),
+            rating=round(rng.uniform(0, 5), 1),
+            review_count=rng.choice([0, 1, rng.randint(0, 100), rng.randint(0, 100_000)]),
+            sales_last_month=rng.choice([0, 1, 10, 1000, rng.randint(0, 50_000)]),
+            search_ranking=rng.choice([0, 1, rng.randint(0, 500)]),
+            sponsored=rng.random() < 0.3,
+        )
+        for _ in range(count)
+    ]
+
+
+def test_calculate_scores_matches_calculate_score():
+    scorer = ProductScorer()
+    products = _random_products(20_000)
+
+    scores = scorer.calculate_scores(ProductColumns.from_products(products))
+
+    assert scores.dtype == np.int64
+    assert scores.tolist() == [scorer.calculate_score(p) for p in products]
+
+
+def test_calculate_scores_empty():
+    scores = ProductScorer().calculate_scores(ProductColumns.from_products([]))
+
+    assert scores.shape == (0,)
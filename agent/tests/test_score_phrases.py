@@ -0,0 +1,52 @@
+"""ClusterKeywordExtractor.score_phrases against the original per-text loop."""
+
+import random
+
+import numpy as np
+
+from services.clustering import ClusterKeywordExtractor
+
+VOCABULARY = "led desk lamp usb charger wireless mouse pad gaming steel bottle lamp lamp".split()
+
+
+def _original_score_phrases(phrases, cluster_texts):
+    """``score_phrases`` as it was before the joined corpus."""
+    scores = {}
+    num_texts = len(cluster_texts)
+
+    for phrase in phrases:
+        coverage = sum(1 for text in cluster_texts if phrase in text) / num_texts
+        length_score = min(len(phrase.split()) / 3, 1.0)
+        positions = []
+        for text in cluster_texts:
+            if phrase in text:
+                positions.append(text.index(phrase) / max(len(text), 1))
+        position_score = 1 - (np.mean(positions) if positions else 1)
+        scores[phrase] = coverage * 0.5 + length_score * 0.3 + position_score * 0.2
+
+    return scores
+
+
+def _texts(rng, count):
+    return [" ".join(rng.choices(VOCABULARY, k=rng.randint(0, 12))) for _ in range(count)]
+
+
+def test_score_phrases_matches_original():
+    rng = random.Random(0)
+    extractor = ClusterKeywordExtractor()
+
+    for _ in range(200):
+        texts = _texts(rng, rng.randint(1, 40))
+        phrases = [
+            " ".join(rng.choices(VOCABULARY, k=rng.randint(1, 3))) for _ in range(15)
+        ] + ["lamp", "lamp", "p l", "a"]
+
+        assert extractor.score_phrases(phrases, texts) == _original_score_phrases(phrases, texts)
+
+
+def test_score_phrases_separator_and_empty_phrases():
+    extractor = ClusterKeywordExtractor()
+    texts = ["desk lamp\nled", "", "led desk lamp", "lamp"]
+    phrases = ["", "lamp\nled", "\n", "desk lamp", "lamp"]
+
+    assert extractor.score_phrases(phrases, texts) == _original_score_phrases(phrases, texts)
@@ -0,0 +1,34 @@
+"""SimilarProductsService: HNSW candidate list sized for the request."""
+
+import pytest
+
+from langchain_core.embeddings import FakeEmbeddings
+
+from services.similarity.search import MAX_EF_SEARCH, SimilarProductsService
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt))
+
+        class _Result:
+            def all(self):
+                return []
+
+        return _Result()
+
+
+@pytest.mark.parametrize(
+    ("k", "exclude_id", "expected"),
+    [(10, None, 40), (40, 7, 41), (100, None, 100), (100, 7, 101), (5000, None, MAX_EF_SEARCH)],
+)
+def test_ef_search_covers_limit(k, exclude_id, expected):
+    service = SimilarProductsService(embeddings_model=FakeEmbeddings(size=4))
+    session = _Session()
+
+    service._search(session, [0.0] * 4, k, exclude_id=exclude_id)
+
+    assert session.statements[0] == f"SET LOCAL hnsw.ef_search = {expected}"
@@ -0,0 +1,94 @@
+"""TextNormalizer against the original re.sub chain of preprocess_text."""
+
+import random
+import re
+
+import pytest
+
+from services.clustering import ClusterKeywordExtractor
+from services.clustering.text_normalizer import TextNormalizer
+
+WORDS = (
+    "wireless bluetooth earbuds noise cancelling headphones stainless steel water bottle "
+    "insulated kitchen knife set organic cotton yoga mat non-slip gaming mouse ergonomic "
+    "led desk lamp dimmable usb-c charger fast charging premium new original for with and "
+    "Wireless Bluetooth Kitchen Premium SONY ANKER (case) & more! 100% 4K 1080p"
+).split()
+
+# Specs, URLs and non-ASCII text, mixed in now and then
+EXTRAS = (
+    "size XL|color: black|500ml|12oz|2-pack|3 pack|10x12|5.5 inch|64GB|https://example.com/item|"
+    "www.shop.com|café|naïve|ΣΟΦΙΑΣ|™|ſize m|ıx|٣ pack|İnch"
+).split("|")
+
+# Strings that exercise pattern interactions and Unicode case folding
+EDGE_CASES = [
+    "size 5gb x",
+    "5 5gb pack",
+    "SIZE\nlarge COLOR:red 3X4 2-Pack",
+    "ſize 10 ſıze ı ſ 5ıx6",
+    "٣٤ gb ٣x٤ color:٣",
+    "K-pack 5 pacK 12Kg",
+    "http://a.b/c?d=1 www.x.y end",
+    "a-5-b 5-6 -7- x.5.y",
+    "ΣΑΣ. ΟΔΟΣ",
+    "nul\x00byte 5\x00gb",
+    "",
+    None,
+    42,
+]
+
+
+def _descriptions(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    separators = [" ", " ", " ", " ", "  ", ", ", " - "]
+
+    def word() -> str:
+        return rng.choice(EXTRAS) if rng.random() < 0.05 else rng.choice(WORDS)
+
+    return [
+        "".join(word() + rng.choice(separators) for _ in range(rng.randint(0, 25)))
+        for _ in range(count)
+    ] + EDGE_CASES
+
+
+def _original_preprocess(extractor, text, remove_brands=True):
+    """``preprocess_text`` as it was before the compiled normalizer."""
+    if not isinstance(text, str):
+        return ""
+
+    text = text.lower()
+    text = re.sub(r"http\S+|www\.\S+", "", text)
+    for pattern in extractor.spec_patterns:
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    if remove_brands:
+        text = re.sub(extractor.brand_pattern, "", text)
+    text = re.sub(r"[^\w\s-]", " ", text)
+    text = re.sub(r"\b\d+\b", "", text)
+    words = [w for w in text.split() if w not in extractor.noise_words and len(w) > 2]
+    return " ".join(words).strip()
+
+
+@pytest.mark.parametrize("remove_brands", [True, False])
+def test_normalizer_matches_original(remove_brands):
+    extractor = ClusterKeywordExtractor()
+    texts = _descriptions(5000)
+
+    expected = [_original_preprocess(extractor, t, remove_brands) for t in texts]
+
+    assert [extractor.preprocess_text(t, remove_brands) for t in texts] == expected
+    assert extractor.preprocess_texts(texts, remove_brands) == expected
+
+
+def test_guards_do_not_skip_case_folded_matches():
+    # Under re.IGNORECASE "ſize" matches "size" without containing the guard
+    normalizer = TextNormalizer(
+        noise_words=[],
+        spec_patterns=[r"\bsize\b"],
+        brand_pattern=r"\b[A-Z]{3}\b",
+        spec_guards=[("size",)],
+    )
+
+    assert normalizer.normalize("Shoe SIZE large") == "shoe large"
+    assert normalizer.normalize("Shoe ſize large") == "shoe large"
+    assert normalizer.normalize_batch(["", None, "tiny ab"]) == ["", "", "tiny"]
@@ -0,0 +1,65 @@
+"""TrendScorer.analyze_batch against the per-series path."""
+
+import numpy as np
+import pytest
+
+from services.scoring.trend_scorer import TrendScorer, stack_series
+
+
+def _random_series(rng: np.random.Generator, count: int):
+    series = []
+    for _ in range(count):
+        length = int(rng.integers(0, 60))
+        kind = rng.integers(0, 4)
+        if kind == 0:
+            values = rng.integers(0, 200, length).astype(float).tolist()
+        elif kind == 1:
+            values = np.round(rng.random(length) * 100, 3).tolist()
+        elif kind == 2:
+            # Exact slopes, right at the classification thresholds
+            step = float(rng.choice([-2.0, 3.0, 5.0, 0.0]))
+            values = [50.0 + step * i for i in range(length)]
+        else:
+            values = [0.0] * length
+        series.append(values or None)
+    return series
+
+
+def _assert_same(scorer, series, sales, reviews):
+    analytics = scorer.analyze_batch(stack_series(series), sales, reviews).to_analytics()
+    for i, values in enumerate(series):
+        expected = scorer.analyze_series(values or [], int(sales[i]), int(reviews[i]))
+        assert analytics[i] == expected, f"row {i}: {values}"
+
+
+def test_analyze_batch_matches_analyze_series():
+    rng = np.random.default_rng(0)
+    series = _random_series(rng, 2000)
+    sales = rng.integers(0, 5000, len(series))
+    reviews = rng.integers(0, 20000, len(series))
+
+    _assert_same(TrendScorer(), series, sales, reviews)
+
+
+@pytest.mark.parametrize("step", [-2.0, 3.0, 5.0])
+def test_analyze_batch_threshold_slopes(step):
+    scorer = TrendScorer()
+    # Normalized slope lands exactly on the threshold, with and without volatility
+    series = [
+        [100.0 + step * i for i in range(length)] if step < 0 else [step * i for i in range(length)]
+        for length in (2, 12, 21, 52)
+    ]
+    series = [[value * 100 / max(values) for value in values] for values in series]
+    sales = np.full(len(series), 500)
+    reviews = np.full(len(series), 100)
+
+    _assert_same(scorer, series, sales, reviews)
+
+
+def test_analyze_batch_skips_missing_points():
+    scorer = TrendScorer()
+    series = np.array([[np.nan, 10.0, np.nan, 30.0, 20.0], [np.nan] * 5])
+    batch = scorer.analyze_batch(series, [100, 100], [10, 10])
+
+    assert batch.to_analytics()[0] == scorer.analyze_series([10.0, 30.0, 20.0], 100, 10)
+    assert batch.to_analytics()[1] == scorer.analyze_series([], 100, 10)